@@ -0,0 +1,230 @@
+import argparse
+import builtins
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import main
+
+SURNAMES = ["SANTOS", "REYES", "CRUZ", "BAUTISTA", "OCAMPO", "GARCIA", "MENDOZA", "TORRES", "TOMAS", "ANDRADA",
+            "CASTILLO", "FLORES", "VILLANUEVA", "RAMOS", "CASTRO", "RIVERA", "AQUINO", "NAVARRO", "SALAZAR", "MERCADO"]
+FIRST_NAMES = ["JUAN", "MARIA", "JOSE", "ANA", "MARK", "JOHN", "ANGELO", "KRISTINE", "PAOLO", "CAMILLE",
+               "MIGUEL", "BEA", "CARLO", "DIANA", "RAFAEL", "ELLA", "GABRIEL", "JASMINE", "LUIS", "NICOLE"]
+PROGRAMS = ["BSCS", "BSIT", "BSIS", "BSE1", "BSA2"]
+
+
+def generate_sections(rng, count):
+    sections = set()
+    while len(sections) < count:
+        section = f"{rng.choice(PROGRAMS)}-{rng.randint(10, 49)}{rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ')}{rng.randint(1, 9)}"
+        if main.validate_section(section):
+            sections.add(section)
+    return sorted(sections)
+
+
+def generate_roster(seed, student_count, section_count):
+    rng = random.Random(seed)
+    sections = generate_sections(rng, section_count)
+    numbers = rng.sample(range(100000, 1000000), student_count)
+
+    students = []
+    for number in numbers:
+        name = f"{rng.choice(SURNAMES)}, {rng.choice(FIRST_NAMES)} {rng.choice('ABCDEFGHIJKLMNOPRSTUVWXYZ')}."
+        students.append((str(number), name, rng.choice(sections)))
+
+    grades = []
+    for student_num, name, section in students:
+        for subject in main.subjects:
+            quarter_grades = [round(rng.uniform(65, 100), 1) for _ in main.quarters]
+            grades.append((student_num, name, section, subject, *quarter_grades, 0, "", 0))
+
+    return students, grades, sections
+
+
+def write_roster(students, grades):
+    with open('students.csv', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(main.STUDENT_HEADERS)
+        writer.writerows(students)
+
+    with open('grades.csv', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(main.GRADE_HEADERS)
+        writer.writerows(grades)
+
+
+def unused_student_numbers(rng, count):
+    numbers = []
+    while len(numbers) < count:
+        number = str(rng.randint(100000, 999999))
+        if number not in main.dict_student and number not in numbers:
+            numbers.append(number)
+    return numbers
+
+
+@contextlib.contextmanager
+def scripted_input(answers):
+    answers = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = original
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run_size(student_count, section_count, seed, repeat):
+    rng = random.Random(seed + 1)
+    students, grades, sections = generate_roster(seed, student_count, section_count)
+    write_roster(students, grades)
+    if main.storage.name == 'sqlite':
+        main.migrate_to_sqlite()
+        main.storage = main.make_storage('sqlite')
+    elif main.storage.name == 'binary':
+        main.convert_snapshot('binary')
+        main.storage = main.make_storage('binary')
+    main.load_from_files()
+    main.recompute_grades()
+    main.compact_files()
+
+    section = sections[0]
+    sample = [student[0] for student in rng.sample(students, repeat)]
+    results = {}
+
+    results['load_from_files'] = timed(main.load_from_files, repeat)
+
+    def full_save():
+        main.set_grade_row(main.grades_dataset[0])
+        main.compact_files()
+
+    results['save_to_files (full snapshot)'] = timed(full_save, repeat)
+
+    def incremental_save():
+        main.set_grade_row(main.grades_dataset[0])
+        main.save_to_files()
+
+    results['save_to_files (incremental)'] = timed(incremental_save, repeat)
+
+    new_numbers = iter(unused_student_numbers(rng, repeat))
+    results['store_student'] = timed(
+        lambda: main.store_student("DELA CRUZ, JUAN P.", next(new_numbers), section), repeat)
+
+    targets = iter(sample)
+    results['compute_quarter_grades (grade update)'] = timed(
+        lambda: (main.apply_quarter_grades(next(targets), 'final', {subject: 88.5 for subject in main.subjects}),
+                 main.save_to_files()), repeat)
+
+    renames = iter(zip(sample, unused_student_numbers(rng, repeat)))
+
+    def renumber():
+        old_num, new_num = next(renames)
+        if old_num in main.dict_student:
+            main.change_student_number(old_num, new_num)
+            main.save_to_files()
+
+    results['edit_student_info (renumber)'] = timed(renumber, repeat)
+
+    def view_all():
+        with scripted_input([]):
+            main.view_all_students_by_section()
+
+    def view_section():
+        with scripted_input([section]):
+            main.view_section_students()
+
+    def view_section_grades():
+        with scripted_input([section]):
+            main.view_section_grades()
+
+    lookups = iter(sorted(main.dict_grades)[:repeat])
+
+    def view_student():
+        with scripted_input([next(lookups)]):
+            main.view_specific_student_grades()
+
+    results['view_all_students_by_section'] = timed(view_all, repeat)
+    results['view_section_students'] = timed(view_section, repeat)
+    results['view_section_grades'] = timed(view_section_grades, repeat)
+    results['view_specific_student_grades'] = timed(view_student, repeat)
+    results['recompute_grades (whole registry)'] = timed(main.recompute_grades, repeat)
+
+    return [
+        {
+            'students': student_count,
+            'sections': section_count,
+            'benchmark': name,
+            'runs': len(timings),
+            'median_seconds': statistics.median(timings),
+            'min_seconds': min(timings),
+            'max_seconds': max(timings),
+        }
+        for name, timings in results.items()
+    ]
+
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the grade book hot paths on synthetic rosters")
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help="Comma-separated student counts (default: 1000,10000,100000)")
+    parser.add_argument('--students-per-section', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per benchmark (default: 5)")
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--storage', choices=['csv', 'sqlite', 'binary'], default='csv')
+    parser.add_argument('--output', help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': main.numpy is not None,
+        'storage': args.storage,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': [],
+    }
+
+    original_dir = os.getcwd()
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            try:
+                main.storage = main.make_storage(args.storage)
+                section_count = max(1, size // args.students_per_section)
+                for result in run_size(size, section_count, args.seed, args.repeat):
+                    report['results'].append(result)
+                    print(f"{size:>8,} {result['benchmark']:<40} {result['median_seconds'] * 1000:>10.2f} ms",
+                          file=sys.stderr)
+            finally:
+                if main.storage.name == 'sqlite' and main.storage.connection is not None:
+                    main.storage.connection.close()
+                os.chdir(original_dir)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main_benchmark()
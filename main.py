@@ -1,145 +1,1607 @@
 import tablib
+import argparse
+import contextlib
+import cProfile
+import csv
+import functools
+import gc
+import heapq
+import json
+import math
 import os
+import pstats
+import re
+import shutil
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice
+
+from validation import (contains_digit, validate_name_format, validate_names, validate_section, validate_sections,
+                        validate_student_number, validate_student_numbers)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 dict_student = {}
 dict_grades = {}
 subjects = ["PROGRAMMING", "DISCRETE", "STATISTICS"]
+quarters = ['prelim', 'midterm', 'prefinal', 'final']
 
-students_dataset = tablib.Dataset()
-students_dataset.headers = ['Student Number', 'Name', 'Section']
+SUBJECT_POSITIONS = {subject: i for i, subject in enumerate(subjects)}
+QUARTER_POSITIONS = {quarter: i for i, quarter in enumerate(quarters)}
+QUARTER_WEIGHTS = [0.20, 0.25, 0.25, 0.30]
+GRADES_PER_STUDENT = len(subjects) * len(quarters)
 
-grades_dataset = tablib.Dataset()
-grades_dataset.headers = ['Student Number', 'Name', 'Section', 'Subject', 'PRELIM', 'MIDTERM', 'PREFINAL', 'FINAL',
-                          'SUBJECT_FINAL_GRADE', 'REMARKS', 'FINAL_AVERAGE']
+grade_matrix = array('d')
 
+GradeSummary = namedtuple('GradeSummary', ['subject_finals', 'final_average', 'quarter_averages'])
 
-def save_to_files():
-    if os.path.exists('students.csv'):
-        os.remove('students.csv')
 
-    with open('students.csv', 'w', newline='') as f:
-        f.write(students_dataset.export('csv'))
+def summarize_grades(offset):
+    width = len(quarters)
+    subject_finals = []
+    passing = []
+    quarter_totals = [0] * width
+    quarter_counts = [0] * width
+
+    for start in range(offset, offset + GRADES_PER_STUDENT, width):
+        block = grade_matrix[start:start + width]
+
+        final_grade = 0
+        for position, weight in enumerate(QUARTER_WEIGHTS):
+            final_grade += block[position] * weight
+        if final_grade != final_grade:
+            final_grade = 0
+        subject_finals.append(final_grade)
+        if final_grade > 0:
+            passing.append(final_grade)
+
+        for position, grade in enumerate(block):
+            if grade == grade:
+                quarter_totals[position] += grade
+                quarter_counts[position] += 1
+
+    return GradeSummary(subject_finals,
+                        sum(passing) / len(passing) if passing else 0,
+                        [total / count if count > 0 else 0 for total, count in zip(quarter_totals, quarter_counts)])
+
+
+class SubjectGrades:
+    __slots__ = ('record', 'offset')
+
+    def __init__(self, record, offset):
+        self.record = record
+        self.offset = offset
+
+    def __contains__(self, quarter):
+        position = QUARTER_POSITIONS.get(quarter)
+        return position is not None and not math.isnan(grade_matrix[self.offset + position])
+
+    def __getitem__(self, quarter):
+        if quarter not in self:
+            raise KeyError(quarter)
+        return grade_matrix[self.offset + QUARTER_POSITIONS[quarter]]
+
+    def __setitem__(self, quarter, grade):
+        grade_matrix[self.offset + QUARTER_POSITIONS[quarter]] = grade if grade else math.nan
+        self.record.derived = None
+
+    def get(self, quarter, default=None):
+        return self[quarter] if quarter in self else default
+
+    def items(self):
+        return [(quarter, self[quarter]) for quarter in quarters if quarter in self]
+
+
+class StudentInfo:
+    __slots__ = ('name', 'section')
+
+    def __init__(self, name, section):
+        self.name = name
+        self.section = section
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+
+class StudentRecord:
+    __slots__ = ('name', 'section', 'final_average', 'remarks', 'offset', 'derived')
+
+    def __init__(self, name, section, offset=None):
+        self.name = name
+        self.section = section
+        self.final_average = None
+        self.remarks = None
+        self.derived = None
+        if offset is None:
+            offset = allocate_grade_block()
+        self.offset = offset
+
+    def subject_offset(self, subject):
+        return self.offset + SUBJECT_POSITIONS[subject] * len(quarters)
+
+    def __contains__(self, key):
+        if key in SUBJECT_POSITIONS:
+            start = self.subject_offset(key)
+            return any(not math.isnan(grade) for grade in grade_matrix[start:start + len(quarters)])
+        if key in ('final_average', 'remarks'):
+            return getattr(self, key) is not None
+        return key in ('name', 'section')
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in SUBJECT_POSITIONS:
+            return SubjectGrades(self, self.subject_offset(key))
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key in SUBJECT_POSITIONS:
+            for quarter in quarters:
+                self.set_grade(key, quarter, value.get(quarter, 0))
+        elif key in self.__slots__:
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def set_grade(self, subject, quarter, grade):
+        grade_matrix[self.subject_offset(subject) + QUARTER_POSITIONS[quarter]] = grade if grade else math.nan
+        self.derived = None
+
+    def summary(self):
+        if self.derived is None:
+            self.derived = summarize_grades(self.offset)
+        return self.derived
+
+    def subject_final(self, subject):
+        return self.summary().subject_finals[SUBJECT_POSITIONS[subject]]
+
+    def quarter_average(self, quarter):
+        return self.summary().quarter_averages[QUARTER_POSITIONS[quarter]]
 
-    if os.path.exists('grades.csv'):
-        os.remove('grades.csv')
 
-    with open('grades.csv', 'w', newline='') as f:
-        f.write(grades_dataset.export('csv'))
+STUDENT_HEADERS = ['Student Number', 'Name', 'Section']
+GRADE_HEADERS = ['Student Number', 'Name', 'Section', 'Subject', 'PRELIM', 'MIDTERM', 'PREFINAL', 'FINAL',
+                 'SUBJECT_FINAL_GRADE', 'REMARKS', 'FINAL_AVERAGE']
+GRADE_VALUE_COLUMNS = [4, 5, 6, 7, 8, 10]
+GRADE_VALUE_HEADERS = {GRADE_HEADERS[position] for position in GRADE_VALUE_COLUMNS}
 
 
-def load_from_files():
-    global students_dataset, grades_dataset, dict_student, dict_grades
+def pool_strings(values):
+    return map(string_pool.setdefault, values, values)
 
-    if os.path.exists('students.csv'):
-        with open('students.csv', 'r') as f:
-            students_dataset = tablib.Dataset().load(f.read(), format='csv')
 
-            dict_student.clear()
-            for row in students_dataset:
-                student_num = row[0]
-                dict_student[student_num] = {
-                    "name": row[1],
-                    "section": row[2]
-                }
+def parse_grade(value):
+    try:
+        return float(value) if value else 0
+    except ValueError:
+        return 0
 
-    if os.path.exists('grades.csv'):
+
+def parse_grades(values, invalid=None):
+    try:
+        return array('d', map(float, values))
+    except (TypeError, ValueError):
+        pass
+
+    grades = array('d')
+    for i, value in enumerate(values):
         try:
-            with open('grades.csv', 'r') as f:
-                content = f.read()
-                if content.strip():
-                    loaded_dataset = tablib.Dataset().load(content, format='csv')
-
-                    if loaded_dataset.headers and len(loaded_dataset.headers) == 11:
-                        grades_dataset = loaded_dataset
-                    else:
-                        print("Warning: grades.csv has incorrect format. Resetting grades dataset.")
-                        grades_dataset = tablib.Dataset()
-                        grades_dataset.headers = ['Student Number', 'Name', 'Section', 'Subject', 'PRELIM', 'MIDTERM',
-                                                  'PREFINAL', 'FINAL', 'SUBJECT_FINAL_GRADE', 'REMARKS',
-                                                  'FINAL_AVERAGE']
-                        os.remove('grades.csv')
-                        return
-                else:
-                    grades_dataset = tablib.Dataset()
-                    grades_dataset.headers = ['Student Number', 'Name', 'Section', 'Subject', 'PRELIM', 'MIDTERM',
-                                              'PREFINAL', 'FINAL', 'SUBJECT_FINAL_GRADE', 'REMARKS', 'FINAL_AVERAGE']
-                    return
+            grades.append(float(value) if value else 0)
+        except (TypeError, ValueError):
+            grades.append(0)
+            if invalid is not None:
+                invalid(i, value)
+    return grades
+
+
+class ColumnTable:
+    def __init__(self, headers, columns=None):
+        self.headers = list(headers)
+        self.numeric = [header in GRADE_VALUE_HEADERS for header in self.headers]
+        if columns is None:
+            columns = [array('d') if numeric else [] for numeric in self.numeric]
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __iter__(self):
+        return zip(*self.columns)
+
+    def __getitem__(self, i):
+        return tuple(column[i] for column in self.columns)
+
+    def __setitem__(self, i, row):
+        for column, numeric, value in zip(self.columns, self.numeric, row):
+            column[i] = parse_grade(value) if numeric else value
+
+    def append(self, row):
+        for column, numeric, value in zip(self.columns, self.numeric, row):
+            column.append(parse_grade(value) if numeric else value)
+
+    def extend(self, rows, invalid=None):
+        for header, column, numeric, values in zip(self.headers, self.columns, self.numeric, zip(*rows)):
+            if not numeric:
+                column.extend(pool_strings(values))
+            elif invalid is None:
+                column.extend(parse_grades(values))
+            else:
+                column.extend(parse_grades(values, lambda i, value: invalid(i, header, value)))
+
+    def trim(self):
+        self.columns = [column[:] for column in self.columns]
+
+
+class QuarterColumn:
+    def __init__(self, position):
+        self.position = position
+
+    def __len__(self):
+        return len(grade_row_offsets)
+
+    def __iter__(self):
+        if numpy is not None and len(grade_row_offsets):
+            matrix = numpy.frombuffer(grade_matrix, dtype=numpy.float64)
+            rows = numpy.frombuffer(grade_row_offsets, dtype=numpy.intc)
+            return iter(array('d', numpy.nan_to_num(matrix[rows + self.position], nan=0.0).tobytes()))
+        grades = [grade_matrix[offset + self.position] for offset in grade_row_offsets]
+        return iter(array('d', [0.0 if math.isnan(grade) else grade for grade in grades]))
+
+    def __getitem__(self, i):
+        grade = grade_matrix[grade_row_offsets[i] + self.position]
+        return 0.0 if math.isnan(grade) else grade
+
+    def __setitem__(self, i, grade):
+        grade_matrix[grade_row_offsets[i] + self.position] = grade or math.nan
+
+    def append(self, grade):
+        self[len(grade_row_offsets) - 1] = grade
+
+
+students_dataset = ColumnTable(STUDENT_HEADERS)
+grades_dataset = ColumnTable(GRADE_HEADERS)
+
+string_pool = {}
+student_row_index = {}
+grade_row_offsets = array('i')
+matrix_grade_rows = array('i')
+orphan_grade_rows = {}
+section_index = {}
+sorted_sections = []
+name_index = []
+trigram_index = {}
+trigram_sizes = array('i')
+trigram_stale_rows = set()
+trigram_lock = threading.Lock()
+
+ROSTER_PAGE_SIZE = 20
+SEARCH_LIMIT = 10
+FUZZY_THRESHOLD = 0.3
+NON_LETTERS = re.compile(r'[\W\d_]+')
+
+CHANGE_LOG_FILE = 'changes.log'
+LOCK_FILE = 'grades.lock'
+VERSION_FILE = 'grades.version'
+SQLITE_FILE = 'grades.db'
+COMPACT_THRESHOLD = 1000
+SNAPSHOT_GENERATIONS = 3
+BINARY_SNAPSHOT_FILE = 'gradebook.bin'
+BINARY_MAGIC = b'SGESCOL1'
+BINARY_HEADER = struct.Struct('<8sIIII')
+SNAPSHOT_CHUNK_ROWS = 16384
+
+pending_changes = []
+deferred_grade_changes = []
+grades_loaded = True
+change_log_records = 0
+lock_depth = 0
+load_stats = {'rows': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+
+trace_path = os.environ.get('SGES_TRACE') or None
+trace_file = None
+trace_stats = {}
+bytes_written = 0
+profile_action = int(os.environ['SGES_PROFILE']) if os.environ.get('SGES_PROFILE', '').isdigit() else None
+
+
+def count_bytes(size):
+    global bytes_written
+    bytes_written += size
+
+
+def record_trace(name, seconds, size):
+    global trace_file
+
+    stats = trace_stats.get(name)
+    if stats is None:
+        stats = trace_stats[name] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'bytes': 0}
+    stats['calls'] += 1
+    stats['seconds'] += seconds
+    stats['max_seconds'] = max(stats['max_seconds'], seconds)
+    stats['bytes'] += size
+
+    if trace_file is None:
+        trace_file = open(trace_path, 'a', buffering=1)
+    event = {'time': round(time.time(), 6), 'event': name, 'seconds': round(seconds, 6)}
+    if size:
+        event['bytes'] = size
+    trace_file.write(json.dumps(event) + '\n')
+
+
+def instrumented(function):
+    name = function.__name__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if trace_path is None:
+            return function(*args, **kwargs)
+
+        started = time.perf_counter()
+        bytes_before = bytes_written
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record_trace(name, time.perf_counter() - started, bytes_written - bytes_before)
+
+    return wrapper
+
+
+def print_trace_summary():
+    if not trace_stats:
+        return
+
+    print(f"\n{'FUNCTION':<30} {'CALLS':>7} {'TOTAL MS':>10} {'MEAN MS':>9} {'MAX MS':>9} {'BYTES':>12}")
+    print("-" * 82)
+    for name, stats in sorted(trace_stats.items(), key=lambda item: item[1]['seconds'], reverse=True):
+        print(f"{name:<30} {stats['calls']:>7,} {stats['seconds'] * 1000:>10.1f} "
+              f"{stats['seconds'] / stats['calls'] * 1000:>9.2f} {stats['max_seconds'] * 1000:>9.2f} "
+              f"{stats['bytes']:>12,}")
+
+    if trace_file is not None:
+        trace_file.write(json.dumps({'time': round(time.time(), 6), 'summary': trace_stats}) + '\n')
+        trace_file.flush()
+    print(f"Trace written to {trace_path}.")
+
+
+def start_profile(action):
+    if action != profile_action:
+        return None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profile(profiler, action):
+    if profiler is None:
+        return
+    profiler.disable()
+
+    path = f"profile-action-{action}.prof"
+    profiler.dump_stats(path)
+    print(f"\nProfile of menu action {action} written to {path}. Top functions by cumulative time:")
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+
+
+def rebuild_indexes():
+    student_row_index.clear()
+    student_row_index.update(zip(students_dataset.columns[0], range(len(students_dataset))))
+
+
+def grade_row_positions(student_num):
+    record = dict_grades.get(student_num)
+    if record is not None:
+        start = record.offset // len(quarters)
+        for i in matrix_grade_rows[start:start + len(subjects)]:
+            if i >= 0:
+                yield i
+    yield from orphan_grade_rows.get(student_num, ())
+
+
+def grade_row_position(student_num, subject):
+    if subject in SUBJECT_POSITIONS:
+        record = dict_grades.get(student_num)
+        i = matrix_grade_rows[record.subject_offset(subject) // len(quarters)] if record is not None else -1
+        return i if i >= 0 else None
+
+    row_subjects = grades_dataset.columns[3]
+    for i in orphan_grade_rows.get(student_num, ()):
+        if row_subjects[i] == subject:
+            return i
+    return None
+
+
+def index_student(student_num):
+    info = dict_student[student_num]
+    name_index.insert(name_index_position(name_index_key(student_num)), student_num)
+    with trigram_lock:
+        add_trigrams(student_row_index[student_num], name_key(info['name']))
+
+    section = info['section']
+    if section not in section_index:
+        section_index[section] = []
+        insort(sorted_sections, section)
+    insort(section_index[section], (info['name'], student_num))
+
+
+def unindex_student(student_num):
+    info = dict_student[student_num]
+    i = name_index_position(name_index_key(student_num))
+    if i < len(name_index) and name_index[i] == student_num:
+        del name_index[i]
+
+    section = info['section']
+    students = section_index.get(section)
+    if not students:
+        return
+
+    entry = (info['name'], student_num)
+    i = bisect_left(students, entry)
+    if i < len(students) and students[i] == entry:
+        del students[i]
+
+    if not students:
+        del section_index[section]
+        del sorted_sections[bisect_left(sorted_sections, section)]
+
+
+def rebuild_section_index():
+    section_index.clear()
+    for student_num, info in dict_student.items():
+        students = section_index.get(info.section)
+        if students is None:
+            students = section_index[info.section] = []
+        students.append((info.name, student_num))
+
+    for students in section_index.values():
+        students.sort()
+    sorted_sections[:] = sorted(section_index)
+
+
+def rebuild_name_index():
+    numbers = list(dict_student)
+    keys = [name_key(info.name) for info in dict_student.values()]
+    order = sorted(range(len(numbers)), key=numbers.__getitem__)
+    order.sort(key=keys.__getitem__)
+    name_index[:] = map(numbers.__getitem__, order)
+
+    trigram_lock.acquire()
+    trigram_index.clear()
+    trigram_stale_rows.clear()
+    trigram_sizes[:] = array('i', [0]) * len(students_dataset)
+    rows = list(zip(map(student_row_index.__getitem__, numbers), keys))
+    threading.Thread(target=build_trigram_index, args=(rows,), daemon=True).start()
+
+
+def build_trigram_index(rows):
+    try:
+        for row, key in rows:
+            add_trigrams(row, key)
+    finally:
+        trigram_lock.release()
+
+
+def name_key(name):
+    return NON_LETTERS.sub(' ', name.upper()).strip()
+
+
+def name_index_key(student_num):
+    return name_key(dict_student[student_num].name), student_num
+
+
+def name_index_position(key):
+    low, high = 0, len(name_index)
+    while low < high:
+        middle = (low + high) // 2
+        if name_index_key(name_index[middle]) < key:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def name_trigrams(key):
+    text = f" {key} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def add_trigrams(row, key):
+    if row >= len(trigram_sizes):
+        trigram_sizes.extend([0] * (row + 1 - len(trigram_sizes)))
+    elif trigram_sizes[row]:
+        trigram_stale_rows.add(row)
+
+    trigrams = name_trigrams(key)
+    for trigram in trigrams:
+        rows = trigram_index.get(trigram)
+        if rows is None:
+            rows = trigram_index[trigram] = array('i')
+        rows.append(row)
+    trigram_sizes[row] = len(trigrams)
+
+
+def fuzzy_name_matches(query, limit=SEARCH_LIMIT):
+    query_trigrams = name_trigrams(name_key(query))
+    if not query_trigrams:
+        return []
+
+    numbers, names, _ = students_dataset.columns
+    minimum = FUZZY_THRESHOLD * len(query_trigrams)
+    scored = []
+    with trigram_lock:
+        shared = Counter(chain.from_iterable(trigram_index.get(trigram, ()) for trigram in query_trigrams))
+        for row, count in shared.items():
+            if count < minimum:
+                continue
+            size = trigram_sizes[row]
+            if row in trigram_stale_rows:
+                trigrams = name_trigrams(name_key(names[row]))
+                count, size = len(query_trigrams & trigrams), len(trigrams)
+            score = count / (len(query_trigrams) + size - count)
+            if score >= FUZZY_THRESHOLD:
+                scored.append((score, numbers[row]))
+
+    return [student_num for _, student_num in heapq.nlargest(limit, scored)]
+
+
+@instrumented
+def search_students(query, limit=SEARCH_LIMIT):
+    query = name_key(query)
+    if not query:
+        return []
+
+    results = []
+    i = name_index_position((query,))
+    while i < len(name_index) and len(results) < limit:
+        key, student_num = name_index_key(name_index[i])
+        if not key.startswith(query):
+            break
+        results.append(student_num)
+        i += 1
+
+    if len(results) < limit:
+        for student_num in fuzzy_name_matches(query, limit):
+            if student_num not in results:
+                results.append(student_num)
+                if len(results) == limit:
+                    break
+
+    return results
+
+
+def update_student_info(student_num, name=None, section=None):
+    unindex_student(student_num)
+
+    info = dict_student[student_num]
+    if name is not None:
+        info['name'] = name
+    if section is not None:
+        info['section'] = section
+
+    update_student_rows(student_num, name=name, section=section)
+    index_student(student_num)
+
+
+def change_student_number(old_num, new_num):
+    unindex_student(old_num)
+
+    dict_student[new_num] = dict_student.pop(old_num)
+    renumber_student_rows(old_num, new_num)
+    index_student(new_num)
+
+
+@instrumented
+def move_section(old_section, new_section):
+    students = section_index.pop(old_section, [])
+    if not students:
+        return 0
+    del sorted_sections[bisect_left(sorted_sections, old_section)]
+
+    for _, student_num in students:
+        dict_student[student_num]['section'] = new_section
+        update_student_rows(student_num, section=new_section)
+
+    if new_section in section_index:
+        section_index[new_section] = sorted(section_index[new_section] + students)
+    else:
+        section_index[new_section] = students
+        insort(sorted_sections, new_section)
+
+    return len(students)
+
+
+def set_student_row(student_num, name, section):
+    row = (student_num, name, section)
+    pending_changes.append(['student', student_num, name, section])
+    if student_num in student_row_index:
+        students_dataset[student_row_index[student_num]] = row
+    else:
+        student_row_index[student_num] = len(students_dataset)
+        students_dataset.append(row)
+
+
+def apply_grade_rows(record):
+    if not grades_loaded:
+        deferred_grade_changes.append(record)
+        return
+
+    op = record[0]
+    columns = grades_dataset.columns
+    if op == 'grade':
+        row = record[1:]
+        i = grade_row_position(row[0], row[3])
+        if i is None:
+            i = len(grades_dataset)
+            offset = grade_row_offset(row)
+            grade_row_offsets.append(offset)
+            matrix_grade_rows[offset // len(quarters)] = i
+            if row[3] not in SUBJECT_POSITIONS:
+                orphan_grade_rows.setdefault(row[0], []).append(i)
+            grades_dataset.append(row)
+        else:
+            grades_dataset[i] = row
+
+        grade_record = dict_grades.get(row[0])
+        if grade_record is not None and row[3] in SUBJECT_POSITIONS:
+            final_average = columns[10][i]
+            grade_record.name = row[1]
+            grade_record.section = row[2]
+            grade_record.final_average = final_average if final_average > 0 else None
+            grade_record.remarks = ("PASSED" if final_average >= 75 else "FAILED") if final_average > 0 else None
+            grade_record.derived = None
+
+    elif op == 'update':
+        _, student_num, name, section = record
+        for i in grade_row_positions(student_num):
+            if name is not None:
+                columns[1][i] = name
+            if section is not None:
+                columns[2][i] = section
+
+        grade_record = dict_grades.get(student_num)
+        if grade_record is not None:
+            if name is not None:
+                grade_record.name = name
+            if section is not None:
+                grade_record.section = section
+
+    elif op == 'renumber':
+        _, old_num, new_num = record
+        for i in grade_row_positions(old_num):
+            columns[0][i] = new_num
+        if old_num in orphan_grade_rows:
+            orphan_grade_rows[new_num] = orphan_grade_rows.pop(old_num)
+        if old_num in dict_grades:
+            dict_grades[new_num] = dict_grades.pop(old_num)
+
+
+def grade_row_offset(row):
+    student_num, name, section, subject = row[:4]
+    if subject not in SUBJECT_POSITIONS:
+        return allocate_grade_block()
+
+    record = dict_grades.get(student_num)
+    if record is None:
+        record = dict_grades[student_num] = StudentRecord(name, section)
+    return record.subject_offset(subject)
+
+
+def allocate_grade_block():
+    offset = len(grade_matrix)
+    grade_matrix.extend([math.nan] * GRADES_PER_STUDENT)
+    matrix_grade_rows.extend([-1] * len(subjects))
+    return offset
+
+
+def set_grade_row(row):
+    record = ['grade'] + list(row)
+    pending_changes.append(record)
+    apply_grade_rows(record)
+
+
+def update_student_rows(student_num, name=None, section=None):
+    record = ['update', student_num, name, section]
+    pending_changes.append(record)
+    if student_num in student_row_index:
+        i = student_row_index[student_num]
+        row = students_dataset[i]
+        students_dataset[i] = (row[0], name if name is not None else row[1], section if section is not None else row[2])
+
+    apply_grade_rows(record)
+
+
+def renumber_student_rows(old_num, new_num):
+    record = ['renumber', old_num, new_num]
+    pending_changes.append(record)
+    if old_num in student_row_index:
+        i = student_row_index.pop(old_num)
+        row = students_dataset[i]
+        students_dataset[i] = (new_num,) + tuple(row[1:])
+        student_row_index[new_num] = i
+
+    apply_grade_rows(record)
+
+
+@instrumented
+def write_student_grade_rows(student_num, subject_finals=None, final_avg=None):
+    record = dict_grades[student_num]
+    info = dict_student[student_num]
+
+    if subject_finals is None:
+        summary = record.summary()
+        subject_finals, final_avg = summary.subject_finals, summary.final_average
+    average_cell = round(final_avg, 2) if final_avg > 0 else 0
+    width = len(quarters)
+
+    for position, subject in enumerate(subjects):
+        start = record.offset + position * width
+        block = grade_matrix[start:start + width]
+        if all(math.isnan(grade) for grade in block):
+            continue
+
+        final_grade = subject_finals[position]
+        set_grade_row((student_num, info['name'], info['section'], subject) +
+                      tuple(0 if math.isnan(grade) else grade for grade in block) +
+                      (round(final_grade, 2) if final_grade > 0 else 0,
+                       ("PASSED" if final_grade >= 75 else "FAILED") if final_grade > 0 else "",
+                       average_cell))
+
+    return final_avg
+
+
+def apply_quarter_grades(student_num, quarter, quarter_grades):
+    ensure_grades_loaded()
+    if student_num not in dict_grades:
+        info = dict_student[student_num]
+        dict_grades[student_num] = StudentRecord(info['name'], info['section'])
+
+    for subject, grade in quarter_grades.items():
+        dict_grades[student_num].set_grade(subject, quarter, grade)
+
+    final_avg = write_student_grade_rows(student_num)
+    if final_avg > 0:
+        dict_grades[student_num]['final_average'] = round(final_avg, 2)
+        dict_grades[student_num]['remarks'] = "PASSED" if final_avg >= 75 else "FAILED"
+    return final_avg
+
+
+def apply_quarter_grade_batch(quarter, entries):
+    ensure_grades_loaded()
+    for student_num, quarter_grades in entries.items():
+        if student_num not in dict_grades:
+            info = dict_student[student_num]
+            dict_grades[student_num] = StudentRecord(info['name'], info['section'])
+
+        for subject, grade in quarter_grades.items():
+            dict_grades[student_num].set_grade(subject, quarter, grade)
+
+    results = compute_grade_results(list(entries))
+    for student_num, (subject_finals, final_avg, remarks) in results.items():
+        write_student_grade_rows(student_num, subject_finals, final_avg)
+        if final_avg > 0:
+            dict_grades[student_num]['final_average'] = round(final_avg, 2)
+            dict_grades[student_num]['remarks'] = remarks
+    return results
+
+
+def apply_change(record):
+    op = record[0]
+    if op == 'student':
+        set_student_row(record[1], record[2], record[3])
+    elif op == 'grade':
+        set_grade_row(tuple(record[1:]))
+    elif op == 'update':
+        update_student_rows(record[1], record[2], record[3])
+    elif op == 'renumber':
+        renumber_student_rows(record[1], record[2])
+
+
+def read_change_log(position=0):
+    records = []
+    if not os.path.exists(CHANGE_LOG_FILE):
+        return records, 0
+
+    with open(CHANGE_LOG_FILE, 'rb') as f:
+        f.seek(position)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            position += len(line)
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"Warning: skipping unreadable entry in {CHANGE_LOG_FILE}.")
+
+    return records, position
+
+
+def replay_change_log():
+    global change_log_records
+
+    records, position = read_change_log()
+    for record in records:
+        apply_change(record)
+
+    change_log_records = len(records)
+    pending_changes.clear()
+    return position
+
+
+def changed_students(records):
+    students = set()
+    for record in records:
+        students.add(record[1])
+        if record[0] == 'renumber':
+            students.add(record[2])
+    return students
+
+
+@contextlib.contextmanager
+def file_lock(path=LOCK_FILE):
+    global lock_depth
+
+    if lock_depth:
+        lock_depth += 1
+        try:
+            yield
+        finally:
+            lock_depth -= 1
+        return
+
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+
+        lock_depth = 1
+        try:
+            yield
+        finally:
+            lock_depth = 0
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class StorageError(Exception):
+    pass
+
+
+def read_version():
+    if not os.path.exists(VERSION_FILE):
+        return 0, None
+    with open(VERSION_FILE, 'r') as f:
+        fields = f.read().split()
+    version = int(fields[0]) if fields and fields[0].isdigit() else 0
+    return version, fields[1] if len(fields) > 1 else None
 
-                dict_grades.clear()
-                current_student = None
-                for row in grades_dataset:
-                    student_num = row[0]
-                    subject = row[3]
-
-                    if student_num != current_student:
-                        dict_grades[student_num] = {
-                            'name': row[1],
-                            'section': row[2],
-                            'final_average': float(row[10]) if row[10] else 0,
-                            'remarks': "PASSED" if (row[10] and float(row[10]) >= 75) else "FAILED"
-                        }
-                        current_student = student_num
-
-                    dict_grades[student_num][subject] = {
-                        'prelim': float(row[4]) if row[4] else 0,
-                        'midterm': float(row[5]) if row[5] else 0,
-                        'prefinal': float(row[6]) if row[6] else 0,
-                        'final': float(row[7]) if row[7] else 0
-                    }
+
+def bump_version(backend):
+    version = read_version()[0] + 1
+    temp_path = VERSION_FILE + '.tmp'
+    with open(temp_path, 'w') as f:
+        f.write(f"{version} {backend}")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, VERSION_FILE)
+    return version
+
+
+def snapshot_backend():
+    backend = read_version()[1]
+    if backend is None:
+        snapshots = [(os.path.getmtime(path), name) for name, path in (('csv', 'students.csv'),
+                                                                      ('binary', BINARY_SNAPSHOT_FILE))
+                     if os.path.exists(path)]
+        if snapshots:
+            backend = max(snapshots)[1]
+    return backend
+
+
+def sync_directory(path):
+    if os.name == 'nt':
+        return
+
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def rotate_generations(path):
+    if SNAPSHOT_GENERATIONS < 1 or not os.path.exists(path):
+        return
+
+    for generation in range(SNAPSHOT_GENERATIONS, 1, -1):
+        older = f"{path}.{generation - 1}"
+        if os.path.exists(older):
+            os.replace(older, f"{path}.{generation}")
+
+    previous = f"{path}.1"
+    if os.path.exists(previous):
+        os.remove(previous)
+
+    try:
+        os.link(path, previous)
+    except OSError:
+        shutil.copyfile(path, previous)
+
+
+def replace_snapshot(temp_path, path):
+    rotate_generations(path)
+    os.replace(temp_path, path)
+    sync_directory(path)
+
+
+def write_snapshot(path, dataset):
+    temp_path = path + '.tmp'
+
+    with open(temp_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(dataset.headers)
+        writer.writerows(dataset)
+        f.flush()
+        os.fsync(f.fileno())
+        count_bytes(f.tell())
+
+    replace_snapshot(temp_path, path)
+
+
+def read_csv_snapshot(path, headers):
+    table = ColumnTable(headers)
+
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+
+        header = next(reader, None)
+        if header is None:
+            return table
+        if len(header) != len(headers):
+            raise ValueError(f"{path} has incorrect format")
+
+        while True:
+            line = reader.line_num
+            chunk = list(islice(reader, SNAPSHOT_CHUNK_ROWS))
+            if not chunk:
+                table.trim()
+                return table
+
+            lines = range(line + 1, line + 1 + len(chunk))
+            lengths = set(map(len, chunk))
+            if 0 in lengths:
+                lengths.discard(0)
+                lines = [row_line for row_line, row in zip(lines, chunk) if row]
+                chunk = [row for row in chunk if row]
+
+            if lengths != {len(headers)}:
+                for row_line, row in zip(lines, chunk):
+                    if len(row) != len(headers):
+                        raise ValueError(f"{path} line {row_line} has {len(row)} columns, expected {len(headers)}")
+
+            table.extend(chunk, lambda i, header, value: print(
+                f"Warning: {path} line {lines[i]} has an invalid {header} grade '{value}'. "
+                f"Loaded it as not recorded."))
+
+
+def read_snapshot(path, headers, load=None):
+    candidates = [path]
+    if os.path.exists(path):
+        candidates += [f"{path}.{generation}" for generation in range(1, SNAPSHOT_GENERATIONS + 1)]
+
+    for candidate in candidates:
+        if not os.path.exists(candidate):
+            continue
+
+        try:
+            if load is None:
+                dataset = read_csv_snapshot(candidate, headers)
+            else:
+                dataset = load(candidate)
+        except ValueError as e:
+            print(f"Warning: {e}.")
+            continue
         except Exception as e:
-            print(f"Error loading grades.csv: {e}. Starting with fresh grades dataset.")
-            grades_dataset = tablib.Dataset()
-            grades_dataset.headers = ['Student Number', 'Name', 'Section', 'Subject', 'PRELIM', 'MIDTERM',
-                                      'PREFINAL', 'FINAL', 'SUBJECT_FINAL_GRADE', 'REMARKS', 'FINAL_AVERAGE']
-            if os.path.exists('grades.csv'):
-                os.remove('grades.csv')
+            print(f"Error loading {candidate}: {e}.")
+            continue
+
+        if candidate != path:
+            print(f"Warning: {path} is unreadable. Loaded previous snapshot {candidate} instead.")
+        return dataset
+
+    return ColumnTable(headers)
+
+
+def binary_column(values, typecode):
+    column = array(typecode, values)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column.tobytes()
+
+
+def binary_numbers(numbers, width):
+    return b''.join(str(number).encode('utf-8').ljust(width) for number in numbers)
+
+
+def intern_string(strings, value):
+    return strings.setdefault('' if value is None else str(value), len(strings))
+
+
+def write_binary_snapshot(path, students, grades):
+    strings = {}
+    width = max((len(str(number).encode('utf-8')) for table in (students, grades) for number in table.columns[0]),
+                default=1)
+
+    columns = [
+        binary_numbers(students.columns[0], width),
+        binary_column((intern_string(strings, value) for value in students.columns[1]), 'I'),
+        binary_column((intern_string(strings, value) for value in students.columns[2]), 'I'),
+        binary_numbers(grades.columns[0], width),
+    ]
+    for position in (1, 2, 3, 9):
+        columns.append(binary_column((intern_string(strings, value) for value in grades.columns[position]), 'I'))
+    for position in GRADE_VALUE_COLUMNS:
+        columns.append(binary_column(grades.columns[position], 'd'))
+
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = [0]
+    for string in encoded:
+        offsets.append(offsets[-1] + len(string))
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, len(students), len(grades), len(encoded), width))
+        for column in [binary_column(offsets, 'I'), b''.join(encoded)] + columns:
+            f.write(column)
+            f.write(b'\0' * (-f.tell() % 8))
+        f.flush()
+        os.fsync(f.fileno())
+        count_bytes(f.tell())
+
+    replace_snapshot(temp_path, path)
+
+
+class BinarySnapshotReader:
+    def __init__(self, path, f):
+        self.path = path
+        self.file = f
+
+    def skip_padding(self, size):
+        self.file.seek(-size % 8, os.SEEK_CUR)
+
+    def take(self, size):
+        chunk = self.file.read(size)
+        if len(chunk) != size:
+            raise ValueError(f"{self.path} is truncated")
+        self.skip_padding(size)
+        return chunk
+
+    def column(self, count, typecode):
+        column = array(typecode, [0]) * count
+        size = count * column.itemsize
+        if self.file.readinto(column) != size:
+            raise ValueError(f"{self.path} is truncated")
+        self.skip_padding(size)
+        if sys.byteorder == 'big':
+            column.byteswap()
+        return column
+
+    def numbers(self, count, width):
+        data = self.take(count * width)
+        numbers = [data[i:i + width].rstrip().decode('utf-8') for i in range(0, len(data), width)]
+        return list(pool_strings(numbers))
+
+
+def read_binary_snapshot(path, table):
+    with open(path, 'rb') as f:
+        reader = BinarySnapshotReader(path, f)
+        magic, student_count, grade_count, string_count, width = BINARY_HEADER.unpack(reader.take(BINARY_HEADER.size))
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a binary grade book snapshot")
+
+        offsets = reader.column(string_count + 1, 'I')
+        blob = reader.take(offsets[-1])
+        strings = [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+        strings = list(pool_strings(strings))
+
+        student_numbers = reader.numbers(student_count, width)
+        student_names = reader.column(student_count, 'I')
+        student_sections = reader.column(student_count, 'I')
+
+        if table == 'students':
+            return ColumnTable(STUDENT_HEADERS, [student_numbers,
+                                                 list(map(strings.__getitem__, student_names)),
+                                                 list(map(strings.__getitem__, student_sections))])
+
+        grade_numbers = reader.numbers(grade_count, width)
+        names, sections, grade_subjects, remarks = [list(map(strings.__getitem__, reader.column(grade_count, 'I')))
+                                                     for _ in range(4)]
+        prelim, midterm, prefinal, final, subject_final, final_average = [
+            reader.column(grade_count, 'd') for _ in GRADE_VALUE_COLUMNS]
+
+        return ColumnTable(GRADE_HEADERS, [grade_numbers, names, sections, grade_subjects, prelim, midterm,
+                                           prefinal, final, subject_final, remarks, final_average])
+
+
+class CsvStorage:
+    name = 'csv'
+
+    def __init__(self):
+        self.version = 0
+        self.log_position = 0
+
+    def locked(self):
+        return file_lock()
+
+    def check_backend(self):
+        backend = snapshot_backend()
+        if backend is not None and backend != self.name:
+            raise StorageError(f"The grade book was last compacted by the {backend} backend, so the {self.name} "
+                               f"snapshot is out of date. Run 'convert-snapshot {self.name}' to switch backends.")
+
+    def read_students(self):
+        self.check_backend()
+        return read_snapshot('students.csv', STUDENT_HEADERS)
+
+    def read_grades(self):
+        return read_snapshot('grades.csv', GRADE_HEADERS)
+
+    def replay(self):
+        self.version = read_version()[0]
+        self.log_position = replay_change_log()
+
+    def merge_external_changes(self):
+        global change_log_records
+
+        ours = list(pending_changes)
+
+        if read_version()[0] != self.version:
+            load_datasets(defer_grades=not grades_loaded)
+            changed = None
+            conflicts = set()
+            print("Note: the grade book was compacted by another session. Reloaded it and re-applied your changes.")
+        else:
+            others, position = read_change_log(self.log_position)
+            self.log_position = position
+            if not others:
+                return
+
+            pending_changes.clear()
+            for record in others:
+                apply_change(record)
+            change_log_records += len(others)
+            changed = changed_students(others)
+            conflicts = changed & changed_students(ours)
+
+        pending_changes.clear()
+        for record in ours:
+            apply_change(record)
+        if changed is None:
+            rebuild_caches()
+        else:
+            for student_num in changed:
+                refresh_student(student_num)
+
+        if conflicts:
+            print(f"Warning: {', '.join(sorted(conflicts))} also changed in another session. "
+                  f"Your changes were applied on top of theirs.")
+
+    def write_changes(self, changes):
+        global change_log_records
+
+        with file_lock():
+            self.merge_external_changes()
+
+            if change_log_records + len(pending_changes) >= COMPACT_THRESHOLD:
+                self.compact()
+                return
+
+            with open(CHANGE_LOG_FILE, 'ab') as f:
+                if f.tell() > self.log_position:
+                    print(f"Warning: discarding an incomplete entry at the end of {CHANGE_LOG_FILE}.")
+                    f.truncate(self.log_position)
+                    f.seek(self.log_position)
+
+                for record in pending_changes:
+                    f.write((json.dumps(record) + '\n').encode())
+                f.flush()
+                os.fsync(f.fileno())
+                count_bytes(f.tell() - self.log_position)
+                self.log_position = f.tell()
+
+            change_log_records += len(pending_changes)
+
+    def compact(self):
+        global change_log_records
+
+        with file_lock():
+            ensure_grades_loaded()
+            self.merge_external_changes()
+            self.write_snapshots()
+            self.version = bump_version(self.name)
+
+            if os.path.exists(CHANGE_LOG_FILE):
+                os.remove(CHANGE_LOG_FILE)
+                sync_directory(CHANGE_LOG_FILE)
+
+            self.log_position = 0
+            change_log_records = 0
+
+    def write_snapshots(self):
+        write_snapshot('students.csv', students_dataset)
+        write_snapshot('grades.csv', grades_dataset)
+
+
+class BinaryStorage(CsvStorage):
+    name = 'binary'
+
+    def read_students(self):
+        self.check_backend()
+        return read_snapshot(BINARY_SNAPSHOT_FILE, STUDENT_HEADERS,
+                             lambda path: read_binary_snapshot(path, 'students'))
+
+    def read_grades(self):
+        return read_snapshot(BINARY_SNAPSHOT_FILE, GRADE_HEADERS,
+                             lambda path: read_binary_snapshot(path, 'grades'))
+
+    def write_snapshots(self):
+        write_binary_snapshot(BINARY_SNAPSHOT_FILE, students_dataset, grades_dataset)
+
+
+class SqliteStorage:
+    name = 'sqlite'
+
+    def __init__(self, path=SQLITE_FILE):
+        self.path = path
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            with self.connection:
+                self.connection.executescript("""
+                    CREATE TABLE IF NOT EXISTS students (
+                        student_num TEXT PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        section TEXT NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS grades (
+                        student_num TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        section TEXT NOT NULL,
+                        subject TEXT NOT NULL,
+                        prelim REAL,
+                        midterm REAL,
+                        prefinal REAL,
+                        final REAL,
+                        subject_final_grade REAL,
+                        remarks TEXT,
+                        final_average REAL,
+                        PRIMARY KEY (student_num, subject)
+                    );
+                    DROP INDEX IF EXISTS students_section;
+                    DROP INDEX IF EXISTS grades_section;
+                """)
+        return self.connection
+
+    def read_students(self):
+        students = ColumnTable(STUDENT_HEADERS)
+        students.extend(self.connect().execute("SELECT student_num, name, section FROM students ORDER BY rowid"))
+        students.trim()
+        return students
+
+    def read_grades(self):
+        grades = ColumnTable(GRADE_HEADERS)
+        grades.extend(self.connect().execute(
+            "SELECT student_num, name, section, subject, prelim, midterm, prefinal, final, subject_final_grade, "
+            "COALESCE(remarks, ''), final_average FROM grades ORDER BY rowid"))
+        grades.trim()
+        return grades
+
+    def locked(self):
+        return contextlib.nullcontext()
+
+    def replay(self):
+        pass
+
+    def merge_external_changes(self):
+        pass
+
+    def write_changes(self, changes):
+        connection = self.connect()
+        with connection:
+            for record in changes:
+                op = record[0]
+                if op == 'student':
+                    connection.execute(
+                        "INSERT INTO students (student_num, name, section) VALUES (?, ?, ?) "
+                        "ON CONFLICT (student_num) DO UPDATE SET name = excluded.name, section = excluded.section",
+                        record[1:4])
+                elif op == 'grade':
+                    connection.execute(
+                        "INSERT INTO grades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (student_num, subject) DO UPDATE SET "
+                        "name = excluded.name, section = excluded.section, prelim = excluded.prelim, "
+                        "midterm = excluded.midterm, prefinal = excluded.prefinal, final = excluded.final, "
+                        "subject_final_grade = excluded.subject_final_grade, remarks = excluded.remarks, "
+                        "final_average = excluded.final_average",
+                        record[1:12])
+                elif op == 'update':
+                    for table in ('students', 'grades'):
+                        connection.execute(
+                            f"UPDATE {table} SET name = COALESCE(?, name), section = COALESCE(?, section) "
+                            f"WHERE student_num = ?",
+                            (record[2], record[3], record[1]))
+                elif op == 'renumber':
+                    for table in ('students', 'grades'):
+                        connection.execute(f"UPDATE {table} SET student_num = ? WHERE student_num = ?",
+                                           (record[2], record[1]))
+
+    def compact(self):
+        if pending_changes:
+            self.write_changes(pending_changes)
+
+    def import_datasets(self, students, grades):
+        connection = self.connect()
+        with connection:
+            connection.executemany("INSERT OR REPLACE INTO students (student_num, name, section) VALUES (?, ?, ?)",
+                                   (tuple(row) for row in students))
+            connection.executemany("INSERT OR REPLACE INTO grades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   (tuple(row) for row in grades))
+
+
+def make_storage(name):
+    if name == 'sqlite':
+        return SqliteStorage()
+    if name == 'binary':
+        return BinaryStorage()
+    return CsvStorage()
+
+
+storage = make_storage(os.environ.get('SGES_STORAGE', 'csv'))
+
+
+@instrumented
+def compact_files():
+    storage.compact()
+    pending_changes.clear()
+
+
+@instrumented
+def save_to_files():
+    if pending_changes:
+        storage.write_changes(pending_changes)
+        pending_changes.clear()
+
+
+def migrate_to_sqlite(path=SQLITE_FILE):
+    global storage
+
+    storage = CsvStorage()
+    load_from_files()
+
+    SqliteStorage(path).import_datasets(students_dataset, grades_dataset)
+    return len(students_dataset), len(grades_dataset)
+
+
+def convert_snapshot(target):
+    global storage
+
+    with file_lock():
+        storage = CsvStorage() if target == 'binary' else BinaryStorage()
+        source = 'students.csv' if target == 'binary' else BINARY_SNAPSHOT_FILE
+        if not os.path.exists(source):
+            raise StorageError(f"{source} does not exist, so there is nothing to convert.")
+
+        load_from_files()
+        compact_files()
+
+        if target == 'binary':
+            write_binary_snapshot(BINARY_SNAPSHOT_FILE, students_dataset, grades_dataset)
+        else:
+            write_snapshot('students.csv', students_dataset)
+            write_snapshot('grades.csv', grades_dataset)
+        bump_version(target)
+
+    return len(students_dataset), len(grades_dataset)
+
+
+@contextlib.contextmanager
+def gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def load_datasets(defer_grades=False):
+    global students_dataset, grades_dataset, grades_loaded
 
+    with storage.locked():
+        students_dataset = storage.read_students()
+        if defer_grades:
+            grades_dataset = ColumnTable(GRADE_HEADERS)
+        else:
+            grades_dataset = storage.read_grades()
+        string_pool.clear()
+        grades_loaded = not defer_grades
+        deferred_grade_changes.clear()
+
+        rebuild_indexes()
+        rebuild_grade_caches()
+        storage.replay()
+    pending_changes.clear()
+
+
+@instrumented
+def ensure_grades_loaded():
+    global grades_dataset, grades_loaded
+
+    if grades_loaded:
+        return
+
+    with gc_paused():
+        with storage.locked():
+            storage.merge_external_changes()
+
+            for column in students_dataset.columns:
+                string_pool.update(zip(column, column))
+            grades_dataset = storage.read_grades()
+            string_pool.clear()
+            grades_loaded = True
+            rebuild_grade_caches()
 
-def validate_section(section):
-    if len(section) != 9 or section[4] != "-":
-        return False
+            for record in deferred_grade_changes:
+                apply_grade_rows(record)
+            deferred_grade_changes.clear()
 
-    if (section[:4].isalpha() and
-            section[5:7].isdigit() and
-            section[7].isalpha() and
-            section[8].isdigit()):
-        return True
 
-    if (section[:3].isalpha() and
-            section[3].isdigit() and
-            section[5:7].isdigit() and
-            section[7].isalpha() and
-            section[8].isdigit()):
-        return True
+@instrumented
+def rebuild_caches():
+    numbers, names, sections = students_dataset.columns
+    dict_student.clear()
+    dict_student.update(zip(numbers, map(StudentInfo, names, sections)))
+    rebuild_section_index()
+    rebuild_name_index()
 
-    return False
 
+def refresh_student(student_num):
+    info = dict_student.get(student_num)
+    if info is not None:
+        unindex_student(student_num)
 
-def validate_name_format(name):
-    if ',' not in name:
-        return False, "Name must be in format: SURNAME, FIRSTNAME M.I."
+    if student_num not in student_row_index:
+        dict_student.pop(student_num, None)
+        dict_grades.pop(student_num, None)
+        return
+
+    _, name, section = students_dataset[student_row_index[student_num]]
+    if info is None:
+        info = dict_student[student_num] = StudentInfo(name, section)
+    else:
+        info.name = name
+        info.section = section
+    index_student(student_num)
+
+    record = dict_grades.get(student_num)
+    if record is not None:
+        record.name = name
+        record.section = section
+
+
+def rebuild_grade_caches():
+    global grade_matrix, matrix_grade_rows
+
+    dict_grades.clear()
+    orphan_grade_rows.clear()
+    del grade_matrix[:]
+    del grade_row_offsets[:]
+    del matrix_grade_rows[:]
+    columns = grades_dataset.columns
+    size = 0
+    for student_num, name, section, subject, final_average in zip(*columns[:4], columns[10]):
+        position = SUBJECT_POSITIONS.get(subject)
+        if position is None:
+            orphan_grade_rows.setdefault(student_num, []).append(len(grade_row_offsets))
+            grade_row_offsets.append(size)
+            size += GRADES_PER_STUDENT
+            continue
+
+        record = dict_grades.get(student_num)
+        if record is None:
+            record = StudentRecord(name, section, size)
+            size += GRADES_PER_STUDENT
+            if final_average > 0:
+                record.final_average = final_average
+                record.remarks = "PASSED" if final_average >= 75 else "FAILED"
+            dict_grades[student_num] = record
+        grade_row_offsets.append(record.offset + position * len(quarters))
+
+    grade_matrix = array('d', [math.nan]) * size
+    matrix_grade_rows = array('i', [-1]) * (size // len(quarters))
+    fill_grade_matrix(columns[4:8])
+    columns[4:8] = [QuarterColumn(position) for position in range(len(quarters))]
+
+
+def fill_grade_matrix(quarter_columns):
+    if numpy is not None and len(grade_row_offsets):
+        matrix = numpy.frombuffer(grade_matrix, dtype=numpy.float64)
+        rows = numpy.frombuffer(grade_row_offsets, dtype=numpy.intc)
+        for position, column in enumerate(quarter_columns):
+            grades = numpy.frombuffer(column, dtype=numpy.float64)
+            matrix[rows + position] = numpy.where(grades != 0, grades, numpy.nan)
+        slots = numpy.frombuffer(matrix_grade_rows, dtype=numpy.intc)
+        slots[rows // len(quarters)] = numpy.arange(len(rows), dtype=numpy.intc)
+        return
 
-    parts = name.split(',')
-    if len(parts) != 2:
-        return False, "Name must be in format: SURNAME, FIRSTNAME M.I."
+    for i, offset in enumerate(grade_row_offsets):
+        matrix_grade_rows[offset // len(quarters)] = i
+    for position, column in enumerate(quarter_columns):
+        for offset, grade in zip(grade_row_offsets, column):
+            grade_matrix[offset + position] = grade or math.nan
 
-    surname = parts[0].strip()
-    given_names = parts[1].strip()
 
-    if not surname or not given_names:
-        return False, "Both surname and given names are required."
+@instrumented
+def load_from_files(defer_grades=False):
+    started = time.perf_counter()
 
-    if not all(char.isalpha() or char.isspace() or char in ".," for char in name):
-        return False, "Name can only contain letters, spaces, commas, and periods."
+    with gc_paused():
+        load_datasets(defer_grades)
+        rebuild_caches()
 
-    return True, ""
+    elapsed = time.perf_counter() - started
+    rows = len(students_dataset) + len(grades_dataset) + change_log_records
+    load_stats['rows'] = rows
+    load_stats['seconds'] = elapsed
+    load_stats['rows_per_second'] = rows / elapsed if elapsed > 0 else 0.0
 
 
 def validate_grade_input(prompt):
     while True:
         try:
             grade = float(input(prompt))
-            if grade < 65 or grade > 100:
+            if math.isnan(grade) or grade < 65 or grade > 100:
                 print("Error: Grade must be between 65 and 100.")
                 continue
             return grade
@@ -147,18 +1609,25 @@ def validate_grade_input(prompt):
             print("Error: Please enter a valid number.")
 
 
-def store_student(name, student_num, section):
-    dict_student[student_num] = {
-        "name": name.upper(),
-        "section": section.upper()
-    }
+def add_student(name, student_num, section):
+    if student_num in dict_student:
+        unindex_student(student_num)
 
-    students_dataset.append([student_num, name.upper(), section.upper()])
-    save_to_files()
+    dict_student[student_num] = StudentInfo(name.upper(), section.upper())
+
+    set_student_row(student_num, name.upper(), section.upper())
+    index_student(student_num)
 
     return dict_student[student_num]
 
 
+def store_student(name, student_num, section):
+    info = add_student(name, student_num, section)
+    save_to_files()
+    return info
+
+
+@instrumented
 def view_all_students_by_section():
     if not dict_student:
         print("No registered students yet.")
@@ -168,25 +1637,123 @@ def view_all_students_by_section():
     print("ALL STUDENTS BY SECTION")
     print("=" * 60)
 
-    sections_dict = {}
-    for student_num, info in dict_student.items():
-        section = info['section']
-        if section not in sections_dict:
-            sections_dict[section] = []
-        sections_dict[section].append((info['name'], student_num))
-
-    for section, students in sorted(sections_dict.items()):
+    for section in sorted_sections:
+        students = section_index[section]
         print(f"\n{section} SECTION:")
         print("-" * 50)
         print(f"{'No.':<4} {'NAME':<30} {'STUDENT NUMBER':<15}")
         print("-" * 50)
 
-        for i, (name, student_num) in enumerate(sorted(students, key=lambda x: x[0]), 1):
+        for i, (name, student_num) in enumerate(students, 1):
             print(f"{i:<4} {name:<30} {student_num:<15}")
 
         print(f"Total in {section}: {len(students)} students")
 
 
+def roster_offsets():
+    offsets = []
+    total = 0
+    for section in sorted_sections:
+        offsets.append(total)
+        total += len(section_index[section])
+    return offsets, total
+
+
+def iter_roster_page(offsets, start, count):
+    i = bisect_right(offsets, start) - 1
+    position = start - offsets[i]
+
+    while count > 0 and i < len(sorted_sections):
+        section = sorted_sections[i]
+        for name, student_num in section_index[section][position:position + count]:
+            position += 1
+            count -= 1
+            yield section, position, name, student_num
+        i += 1
+        position = 0
+
+
+@instrumented
+def browse_roster(page_size=ROSTER_PAGE_SIZE):
+    if not dict_student:
+        print("No registered students yet.")
+        return None
+
+    offsets, total = roster_offsets()
+    start = 0
+
+    while True:
+        end = min(start + page_size, total)
+        print(f"\nREGISTERED STUDENTS (Organized by Section) - showing {start + 1}-{end} of {total}")
+        print("-" * 60)
+
+        current_section = None
+        for section, position, name, student_num in iter_roster_page(offsets, start, page_size):
+            if section != current_section:
+                suffix = "" if position == 1 else " (continued)"
+                print(f"\n{section} SECTION{suffix}:")
+                current_section = section
+            print(f"  {name} - {student_num}")
+
+        print("\n" + "-" * 60)
+        print("N = next page, P = previous page, S <SECTION> = jump to section")
+        command = input("Enter student number, a command, or press Enter to go back: ").strip().upper()
+
+        if not command:
+            return None
+
+        if command in dict_student:
+            return command
+
+        if command == 'N':
+            if end < total:
+                start = end
+        elif command == 'P':
+            start = max(start - page_size, 0)
+        elif command.startswith('S'):
+            section = command[1:].strip() or input("Jump to section: ").strip().upper()
+            i = bisect_left(sorted_sections, section)
+            if i == len(sorted_sections):
+                print(f"No sections found from {section} onwards.")
+            else:
+                start = offsets[i]
+        else:
+            print("Student not found or invalid command.")
+
+
+def find_student(query=None):
+    if query is None:
+        query = input("Enter name or name prefix (e.g., DELA CRUZ, JUAN): ")
+
+    results = search_students(query)
+    if not results:
+        print(f"No students found matching '{query.strip()}'.")
+        return None
+
+    print(f"\n{'#':<4} {'STUDENT NUMBER':<16} {'NAME':<40} SECTION")
+    print("-" * 75)
+    for i, student_num in enumerate(results, 1):
+        info = dict_student[student_num]
+        print(f"{i:<4} {student_num:<16} {info['name']:<40} {info['section']}")
+
+    choice = input("\nSelect # or student number (Enter to go back): ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(results):
+        return results[int(choice) - 1]
+    if choice in dict_student:
+        return choice
+    return None
+
+
+def select_student(prompt):
+    student_num = input(prompt).strip()
+    if student_num.upper() == 'B':
+        return browse_roster()
+    if student_num and not student_num.isdigit():
+        return find_student(student_num)
+    return student_num
+
+
+@instrumented
 def view_section_students():
     if not dict_student:
         print("No registered students yet.")
@@ -194,10 +1761,7 @@ def view_section_students():
 
     section = input("Enter section to view (e.g., BSCS-12M1): ").upper()
 
-    section_students = []
-    for row in students_dataset:
-        if row[2] == section:
-            section_students.append((row[1], row[0]))
+    section_students = section_index.get(section, [])
 
     if not section_students:
         print(f"No students found in section {section}.")
@@ -208,7 +1772,7 @@ def view_section_students():
     print(f"{'No.':<4} {'NAME':<30} {'STUDENT NUMBER':<15}")
     print("-" * 50)
 
-    for i, (name, student_num) in enumerate(sorted(section_students, key=lambda x: x[0]), 1):
+    for i, (name, student_num) in enumerate(section_students, 1):
         print(f"{i:<4} {name:<30} {student_num:<15}")
 
     print(f"Total: {len(section_students)} students")
@@ -250,17 +1814,116 @@ def calculate_final_average(grades):
     return sum(subject_final_grades) / len(subject_final_grades) if subject_final_grades else 0
 
 
-def view_specific_student_grades():
+def compute_grade_results(student_nums=None):
+    if student_nums is None:
+        student_nums = list(dict_grades)
+    else:
+        student_nums = [num for num in student_nums if num in dict_grades]
+
+    if not student_nums:
+        return {}
+
+    if numpy is not None:
+        finals, averages = compute_grade_columns_numpy(student_nums)
+    else:
+        finals, averages = compute_grade_columns(student_nums)
+
+    remarks = [("PASSED" if final_avg >= 75 else "FAILED") if final_avg > 0 else None for final_avg in averages]
+    return dict(zip(student_nums, zip(finals, averages, remarks)))
+
+
+def compute_grade_columns_numpy(student_nums):
+    blocks = numpy.frombuffer(grade_matrix, dtype=numpy.float64).reshape(-1, len(subjects), len(quarters))
+    rows = numpy.fromiter((dict_grades[num].offset // GRADES_PER_STUDENT for num in student_nums),
+                          dtype=numpy.intp, count=len(student_nums))
+    selected = blocks[rows]
+
+    finals = selected[:, :, 0] * QUARTER_WEIGHTS[0]
+    for position in range(1, len(quarters)):
+        finals = finals + selected[:, :, position] * QUARTER_WEIGHTS[position]
+    finals = numpy.where(numpy.isnan(finals), 0.0, finals)
+
+    totals = numpy.zeros(len(student_nums))
+    counts = numpy.zeros(len(student_nums))
+    for position in range(len(subjects)):
+        column = finals[:, position]
+        totals = totals + numpy.where(column > 0, column, 0.0)
+        counts = counts + (column > 0)
+    averages = numpy.divide(totals, counts, out=numpy.zeros(len(student_nums)), where=counts > 0)
+
+    return finals.tolist(), averages.tolist()
+
+
+def compute_grade_columns(student_nums):
+    width = len(quarters)
+    selected = array('d')
+    for student_num in student_nums:
+        offset = dict_grades[student_num].offset
+        selected.extend(grade_matrix[offset:offset + GRADES_PER_STUDENT])
+
+    totals = [0] * (len(selected) // width)
+    for position, weight in enumerate(QUARTER_WEIGHTS):
+        totals = [total + grade * weight for total, grade in zip(totals, selected[position::width])]
+    totals = [total if total == total else 0 for total in totals]
+
+    finals = [totals[start:start + len(subjects)] for start in range(0, len(totals), len(subjects))]
+    averages = []
+    for subject_finals in finals:
+        passing = [grade for grade in subject_finals if grade > 0]
+        averages.append(sum(passing) / len(passing) if passing else 0)
+
+    return finals, averages
+
+
+@instrumented
+def recompute_grades(student_nums=None):
+    ensure_grades_loaded()
+    results = compute_grade_results(student_nums)
+
+    columns = grades_dataset.columns
+    final_cells, remark_cells, average_cells = columns[8], columns[9], columns[10]
+
+    for student_num, (subject_finals, final_avg, remarks) in results.items():
+        record = dict_grades[student_num]
+        average_cell = round(final_avg, 2) if final_avg > 0 else 0
+        record.final_average = average_cell or None
+        record.remarks = remarks
+
+        start = record.offset // len(quarters)
+        for final_grade, i in zip(subject_finals, matrix_grade_rows[start:start + len(subjects)]):
+            if i < 0:
+                continue
+            if final_grade > 0:
+                final_cell = round(final_grade, 2)
+                subject_remarks = "PASSED" if final_grade >= 75 else "FAILED"
+            else:
+                final_cell = 0
+                subject_remarks = ""
+
+            if (final_cells[i] != final_cell or remark_cells[i] != subject_remarks or
+                    average_cells[i] != average_cell):
+                final_cells[i] = final_cell
+                remark_cells[i] = subject_remarks
+                average_cells[i] = average_cell
+                pending_changes.append(['grade'] + [column[i] for column in columns])
+
+    return results
+
+
+@instrumented
+def view_specific_student_grades(student_num=None):
     if not dict_student:
         print("No registered students yet.")
         return
 
-    student_num = input("Enter student number: ")
+    if student_num is None:
+        student_num = input("Enter student number: ")
 
     if student_num not in dict_student:
         print("Student not found!")
         return
 
+    ensure_grades_loaded()
     student_info = dict_student[student_num]
     student_name = student_info['name']
 
@@ -281,7 +1944,7 @@ def view_specific_student_grades():
     for subject in subjects:
         if subject in grades:
             subj_grades = grades[subject]
-            final_grade = calculate_final_subject_grade(grades, subject)
+            final_grade = grades.subject_final(subject)
 
             print(f"{subject:<15} "
                   f"{subj_grades.get('prelim', 0):<10.1f} "
@@ -297,6 +1960,7 @@ def view_specific_student_grades():
         print("-" * 80)
 
 
+@instrumented
 def view_section_grades():
     if not dict_student:
         print("No registered students yet.")
@@ -304,20 +1968,19 @@ def view_section_grades():
 
     section = input("Enter section to view grades (e.g., BSCS-12M1): ").upper()
 
-    section_students = []
-    for student_num, info in dict_student.items():
-        if info['section'] == section:
-            section_students.append((info['name'], student_num))
+    section_students = section_index.get(section, [])
 
     if not section_students:
         print(f"No students found in section {section}.")
         return
 
+    ensure_grades_loaded()
+
     print(f"\n{'=' * 80}")
     print(f"GRADES FOR SECTION: {section}")
     print(f"{'=' * 80}")
 
-    for name, student_num in sorted(section_students, key=lambda x: x[0]):
+    for name, student_num in section_students:
         print(f"\n{name} ({student_num}):")
         print("-" * 70)
 
@@ -330,7 +1993,7 @@ def view_section_grades():
             for subject in subjects:
                 if subject in grades:
                     subj_grades = grades[subject]
-                    final_grade = calculate_final_subject_grade(grades, subject)
+                    final_grade = grades.subject_final(subject)
 
                     print(f"{subject:<15} "
                           f"{subj_grades.get('prelim', 0):<10.1f} "
@@ -355,6 +2018,7 @@ def view_student_records_menu():
         print("3. View specific student's grades")
         print("4. View grades of all students in a section")
         print("5. Return to main menu")
+        print("6. Search students by name")
 
         try:
             choice = int(input("\nEnter choice: "))
@@ -381,8 +2045,14 @@ def view_student_records_menu():
         elif choice == 5:
             break
 
+        elif choice == 6:
+            student_num = find_student()
+            if student_num is not None:
+                view_specific_student_grades(student_num)
+            input("\nPress Enter to continue...")
+
         else:
-            print("Invalid choice. Please select 1-5.")
+            print("Invalid choice. Please select 1-6.")
 
 
 def compute_quarter_grades():
@@ -391,30 +2061,19 @@ def compute_quarter_grades():
         input("Press Enter to return to main menu...")
         return
 
+    ensure_grades_loaded()
+
     print("\n" + "=" * 50)
     print("TEACHER'S LOG - GRADE COMPUTATION BY QUARTER")
     print("=" * 50)
 
     while True:
-        print("\nREGISTERED STUDENTS (Organized by Section):")
-        print("-" * 60)
-
-        sections_dict = {}
-        for student_num, info in dict_student.items():
-            section = info['section']
-            if section not in sections_dict:
-                sections_dict[section] = []
-            sections_dict[section].append((info['name'], student_num))
-
-        for section, students in sorted(sections_dict.items()):
-            print(f"\n{section} SECTION:")
-            for name, student_num in sorted(students, key=lambda x: x[0]):
-                print(f"  {name} - {student_num}")
-
-        print("\n" + "-" * 60)
+        print(f"\n{len(dict_student)} registered students in {len(sorted_sections)} sections.")
         print("\nSelect student to compute grades:")
         print("1. Enter student number")
         print("2. Return to main menu")
+        print("3. Browse registered students")
+        print("4. Enter grades for a whole section")
 
         try:
             choice = int(input("\nEnter choice: "))
@@ -425,8 +2084,13 @@ def compute_quarter_grades():
         if choice == 2:
             break
 
-        elif choice == 1:
-            student_num = input("Enter student number: ")
+        elif choice in (1, 3):
+            if choice == 1:
+                student_num = input("Enter student number: ")
+            else:
+                student_num = browse_roster()
+                if student_num is None:
+                    continue
 
             if student_num not in dict_student:
                 print("Student not found. Please enter a registered student number.")
@@ -460,18 +2124,6 @@ def compute_quarter_grades():
 
             quarter = quarter_map[quarter_choice]
 
-            student_grades = {}
-            if student_num in dict_grades:
-                student_grades = dict_grades[student_num].copy()
-                for subject in subjects:
-                    if subject in student_grades:
-                        student_grades[subject] = student_grades[subject].copy()
-            else:
-                student_grades = {
-                    'name': student_name,
-                    'section': dict_student[student_num]['section']
-                }
-
             print(f"\nComputing {quarter.upper()} QUARTER grades:")
             print("-" * 30)
 
@@ -509,11 +2161,6 @@ def compute_quarter_grades():
                 grade = validate_grade_input(f"  Enter {quarter.upper()} grade (65-100): ")
                 quarter_grades[subject] = grade
 
-                if subject not in student_grades:
-                    student_grades[subject] = {}
-
-                student_grades[subject][quarter] = grade
-
             quarter_average = sum(quarter_grades.values()) / len(subjects)
 
             print(f"\n{'=' * 50}")
@@ -523,64 +2170,7 @@ def compute_quarter_grades():
             print(f"STATUS: {quarter_status}")
             print(f"{'=' * 50}")
 
-            dict_grades[student_num] = student_grades
-
-            for subject in subjects:
-                if subject in student_grades:
-                    subj_grades = student_grades[subject]
-
-                    final_grade = 0
-                    remarks = ""
-                    if all(period in subj_grades for period in ['prelim', 'midterm', 'prefinal', 'final']):
-                        final_grade = calculate_final_subject_grade(student_grades, subject)
-                        remarks = "PASSED" if final_grade >= 75 else "FAILED"
-
-                    found = False
-                    for i, row in enumerate(grades_dataset):
-                        if row[0] == student_num and row[3] == subject:
-                            grades_dataset[i] = (
-                                student_num,
-                                student_name,
-                                dict_student[student_num]['section'],
-                                subject,
-                                subj_grades.get('prelim', 0),
-                                subj_grades.get('midterm', 0),
-                                subj_grades.get('prefinal', 0),
-                                subj_grades.get('final', 0),
-                                round(final_grade, 2) if final_grade > 0 else 0,
-                                remarks if remarks else "",
-                                0
-                            )
-                            found = True
-                            break
-
-                    if not found:
-                        grades_dataset.append([
-                            student_num,
-                            student_name,
-                            dict_student[student_num]['section'],
-                            subject,
-                            subj_grades.get('prelim', 0),
-                            subj_grades.get('midterm', 0),
-                            subj_grades.get('prefinal', 0),
-                            subj_grades.get('final', 0),
-                            round(final_grade, 2) if final_grade > 0 else 0,
-                            remarks if remarks else "",
-                            0
-                        ])
-
-            final_avg = calculate_final_average(student_grades)
-            if final_avg > 0:
-                dict_grades[student_num]['final_average'] = round(final_avg, 2)
-                dict_grades[student_num]['remarks'] = "PASSED" if final_avg >= 75 else "FAILED"
-
-                for i, row in enumerate(grades_dataset):
-                    if row[0] == student_num:
-                        grades_dataset[i] = (
-                            row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-                            round(final_avg, 2)
-                        )
-
+            apply_quarter_grades(student_num, quarter, quarter_grades)
             save_to_files()
 
             print(f"\n" + "=" * 50)
@@ -614,8 +2204,88 @@ def compute_quarter_grades():
             elif next_choice == 3:
                 break
 
+        elif choice == 4:
+            enter_section_grades()
+
         else:
-            print("Invalid choice. Please select 1 or 2.")
+            print("Invalid choice. Please select 1-4.")
+
+
+def enter_section_grades():
+    section = input("Enter section (e.g., BSCS-12M1): ").upper()
+    section_students = section_index.get(section, [])
+
+    if not section_students:
+        print(f"No students found in section {section}.")
+        return
+
+    print("\nSelect QUARTER to enter:")
+    print("1. PRELIM Quarter")
+    print("2. MIDTERM Quarter")
+    print("3. PREFINAL Quarter")
+    print("4. FINAL Quarter")
+
+    quarter_map = {1: 'prelim', 2: 'midterm', 3: 'prefinal', 4: 'final'}
+    try:
+        quarter = quarter_map.get(int(input("\nEnter choice: ")))
+    except ValueError:
+        quarter = None
+    if quarter is None:
+        print("Invalid choice.")
+        return
+
+    print(f"\n{'=' * 70}")
+    print(f"{quarter.upper()} GRADES FOR SECTION: {section} ({len(section_students)} students)")
+    print(f"{'=' * 70}")
+    print(f"Enter {', '.join(subjects)} grades (65-100) separated by spaces.")
+    print("Leave blank to skip a student.\n")
+
+    entries = {}
+    for i, (name, student_num) in enumerate(section_students, 1):
+        while True:
+            values = input(f"[{i}/{len(section_students)}] {name} ({student_num}): ").replace(',', ' ').split()
+            if not values:
+                break
+
+            if len(values) != len(subjects):
+                print(f"Please enter exactly {len(subjects)} grades.")
+                continue
+            try:
+                grades = [float(value) for value in values]
+            except ValueError:
+                print("Please enter valid numbers.")
+                continue
+            if any(math.isnan(grade) or grade < 65 or grade > 100 for grade in grades):
+                print("Grades must be between 65 and 100.")
+                continue
+
+            entries[student_num] = dict(zip(subjects, grades))
+            break
+
+    if not entries:
+        print("\nNo grades entered.")
+        return
+
+    print(f"\n{'NAME':<30} " + " ".join(f"{subject:<12}" for subject in subjects) + f" {'AVERAGE':<8} STATUS")
+    print("-" * 90)
+    for name, student_num in section_students:
+        if student_num in entries:
+            grades = entries[student_num]
+            quarter_average = sum(grades.values()) / len(subjects)
+            print(f"{name:<30} " + " ".join(f"{grades[subject]:<12.1f}" for subject in subjects) +
+                  f" {quarter_average:<8.2f} {'PASSED' if quarter_average >= 75 else 'FAILED'}")
+
+    confirm = input(f"\nSave {quarter.upper()} grades for {len(entries)} students? (Y/N): ").strip().upper()
+    if confirm != 'Y':
+        print("Grades discarded.")
+        return
+
+    apply_quarter_grade_batch(quarter, entries)
+    save_to_files()
+
+    print(f"\n{'=' * 50}")
+    print(f"{quarter.upper()} grades saved for {len(entries)} students in {section}!")
+    print("=" * 50)
 
 
 def edit_student_grades(student_num=None):
@@ -624,27 +2294,16 @@ def edit_student_grades(student_num=None):
         return
 
     if student_num is None:
-        print("\nREGISTERED STUDENTS (Organized by Section):")
-        print("-" * 60)
-
-        sections_dict = {}
-        for num, info in dict_student.items():
-            section = info['section']
-            if section not in sections_dict:
-                sections_dict[section] = []
-            sections_dict[section].append((info['name'], num))
-
-        for section, students in sorted(sections_dict.items()):
-            print(f"\n{section} SECTION:")
-            for name, num in sorted(students, key=lambda x: x[0]):
-                print(f"  {name} - {num}")
-
-        student_num = input("\nEnter student number to edit grades: ")
+        student_num = select_student("\nEnter student number or name to edit grades (B to browse): ")
+        if student_num is None:
+            return
 
     if student_num not in dict_student:
         print("Student not found!")
         return
 
+    ensure_grades_loaded()
+
     if student_num not in dict_grades:
         print("No grades computed for this student yet.")
         return
@@ -686,7 +2345,7 @@ def edit_student_grades(student_num=None):
                 for subject in subjects:
                     if subject in grades:
                         subj_grades = grades[subject]
-                        final_grade = calculate_final_subject_grade(grades, subject)
+                        final_grade = grades.subject_final(subject)
                         print(f"{subject:<15} "
                               f"{subj_grades.get('prelim', 0):<10.1f} "
                               f"{subj_grades.get('midterm', 0):<10.1f} "
@@ -695,10 +2354,10 @@ def edit_student_grades(student_num=None):
                               f"{final_grade:<12.2f}")
 
                 print("\nOVERALL QUARTER AVERAGES:")
-                print(f"  PRELIM: {calculate_quarter_average(grades, 'prelim'):.2f}")
-                print(f"  MIDTERM: {calculate_quarter_average(grades, 'midterm'):.2f}")
-                print(f"  PREFINAL: {calculate_quarter_average(grades, 'prefinal'):.2f}")
-                print(f"  FINAL: {calculate_quarter_average(grades, 'final'):.2f}")
+                print(f"  PRELIM: {grades.quarter_average('prelim'):.2f}")
+                print(f"  MIDTERM: {grades.quarter_average('midterm'):.2f}")
+                print(f"  PREFINAL: {grades.quarter_average('prefinal'):.2f}")
+                print(f"  FINAL: {grades.quarter_average('final'):.2f}")
 
                 if 'final_average' in grades:
                     print(f"\nOVERALL FINAL GRADE AVERAGE: {grades['final_average']:.2f}")
@@ -746,63 +2405,23 @@ def edit_student_grades(student_num=None):
 
             new_grades = {}
             for subject in subjects:
+                if subject not in dict_grades[student_num]:
+                    continue
                 current_grade = dict_grades[student_num][subject].get(quarter, 0)
                 print(f"\n{subject} (Current: {current_grade:.1f})")
                 new_grade = validate_grade_input(f"  Enter new {quarter} grade (65-100): ")
                 new_grades[subject] = new_grade
 
-            for subject, new_grade in new_grades.items():
-                dict_grades[student_num][subject][quarter] = new_grade
-
-                for i, row in enumerate(grades_dataset):
-                    if row[0] == student_num and row[3] == subject:
-                        old_prelim = float(row[4]) if row[4] else 0
-                        old_midterm = float(row[5]) if row[5] else 0
-                        old_prefinal = float(row[6]) if row[6] else 0
-                        old_final = float(row[7]) if row[7] else 0
-
-                        if quarter == 'prelim':
-                            prelim, midterm, prefinal, final = new_grade, old_midterm, old_prefinal, old_final
-                        elif quarter == 'midterm':
-                            prelim, midterm, prefinal, final = old_prelim, new_grade, old_prefinal, old_final
-                        elif quarter == 'prefinal':
-                            prelim, midterm, prefinal, final = old_prelim, old_midterm, new_grade, old_final
-                        elif quarter == 'final':
-                            prelim, midterm, prefinal, final = old_prelim, old_midterm, old_prefinal, new_grade
-
-                        final_grade_calc = 0
-                        remarks_calc = ""
-                        if all(grade > 0 for grade in [prelim, midterm, prefinal, final]):
-                            final_grade_calc = (prelim * 0.20) + (midterm * 0.25) + (prefinal * 0.25) + (final * 0.30)
-                            remarks_calc = "PASSED" if final_grade_calc >= 75 else "FAILED"
-
-                        grades_dataset[i] = (
-                            row[0], row[1], row[2], row[3],
-                            prelim, midterm, prefinal, final,
-                            round(final_grade_calc, 2) if final_grade_calc > 0 else 0,
-                            remarks_calc if remarks_calc else "",
-                            row[10] if len(row) > 10 else 0
-                        )
-                        break
-
-            final_avg = calculate_final_average(dict_grades[student_num])
-            dict_grades[student_num]['final_average'] = round(final_avg, 2)
-            dict_grades[student_num]['remarks'] = "PASSED" if final_avg >= 75 else "FAILED"
-
-            for i, row in enumerate(grades_dataset):
-                if row[0] == student_num:
-                    grades_dataset[i] = (
-                        row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-                        round(final_avg, 2)
-                    )
+            apply_quarter_grades(student_num, quarter, new_grades)
 
-            quarter_avg = calculate_quarter_average(dict_grades[student_num], quarter)
+            quarter_avg = dict_grades[student_num].quarter_average(quarter)
 
             print(f"\n" + "=" * 50)
             print(f"All {quarter.upper()} grades updated successfully!")
             print(f"Updated OVERALL {quarter.upper()} QUARTER AVERAGE: {quarter_avg:.2f}")
-            print(f"Updated OVERALL FINAL GRADE AVERAGE: {dict_grades[student_num]['final_average']:.2f}")
-            print(f"Updated FINAL REMARKS: {dict_grades[student_num]['remarks']}")
+            if 'final_average' in dict_grades[student_num]:
+                print(f"Updated OVERALL FINAL GRADE AVERAGE: {dict_grades[student_num]['final_average']:.2f}")
+                print(f"Updated FINAL REMARKS: {dict_grades[student_num]['remarks']}")
             print("=" * 50)
 
         elif 2 <= edit_choice <= len(subjects) + 1:
@@ -816,58 +2435,17 @@ def edit_student_grades(student_num=None):
             print(f"\nEditing {subject} - {quarter.upper()} (Current: {current_grade:.1f})")
             new_grade = validate_grade_input(f"Enter new {quarter} grade for {subject} (65-100): ")
 
-            dict_grades[student_num][subject][quarter] = new_grade
-
-            for i, row in enumerate(grades_dataset):
-                if row[0] == student_num and row[3] == subject:
-                    old_prelim = float(row[4]) if row[4] else 0
-                    old_midterm = float(row[5]) if row[5] else 0
-                    old_prefinal = float(row[6]) if row[6] else 0
-                    old_final = float(row[7]) if row[7] else 0
-
-                    if quarter == 'prelim':
-                        prelim, midterm, prefinal, final = new_grade, old_midterm, old_prefinal, old_final
-                    elif quarter == 'midterm':
-                        prelim, midterm, prefinal, final = old_prelim, new_grade, old_prefinal, old_final
-                    elif quarter == 'prefinal':
-                        prelim, midterm, prefinal, final = old_prelim, old_midterm, new_grade, old_final
-                    elif quarter == 'final':
-                        prelim, midterm, prefinal, final = old_prelim, old_midterm, old_prefinal, new_grade
-
-                    final_grade_calc = 0
-                    remarks_calc = ""
-                    if all(grade > 0 for grade in [prelim, midterm, prefinal, final]):
-                        final_grade_calc = (prelim * 0.20) + (midterm * 0.25) + (prefinal * 0.25) + (final * 0.30)
-                        remarks_calc = "PASSED" if final_grade_calc >= 75 else "FAILED"
-
-                    grades_dataset[i] = (
-                        row[0], row[1], row[2], row[3],
-                        prelim, midterm, prefinal, final,
-                        round(final_grade_calc, 2) if final_grade_calc > 0 else 0,
-                        remarks_calc if remarks_calc else "",
-                        row[10] if len(row) > 10 else 0
-                    )
-                    break
+            apply_quarter_grades(student_num, quarter, {subject: new_grade})
 
-            final_avg = calculate_final_average(dict_grades[student_num])
-            dict_grades[student_num]['final_average'] = round(final_avg, 2)
-            dict_grades[student_num]['remarks'] = "PASSED" if final_avg >= 75 else "FAILED"
-
-            for i, row in enumerate(grades_dataset):
-                if row[0] == student_num:
-                    grades_dataset[i] = (
-                        row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-                        round(final_avg, 2)
-                    )
-
-            quarter_avg = calculate_quarter_average(dict_grades[student_num], quarter)
+            quarter_avg = dict_grades[student_num].quarter_average(quarter)
 
             print(f"\n" + "=" * 50)
             print(f"Grade updated successfully!")
             print(f"New {quarter} grade for {subject}: {new_grade}")
             print(f"Updated OVERALL {quarter.upper()} QUARTER AVERAGE: {quarter_avg:.2f}")
-            print(f"Updated OVERALL FINAL GRADE AVERAGE: {dict_grades[student_num]['final_average']:.2f}")
-            print(f"Updated FINAL REMARKS: {dict_grades[student_num]['remarks']}")
+            if 'final_average' in dict_grades[student_num]:
+                print(f"Updated OVERALL FINAL GRADE AVERAGE: {dict_grades[student_num]['final_average']:.2f}")
+                print(f"Updated FINAL REMARKS: {dict_grades[student_num]['remarks']}")
             print("=" * 50)
         else:
             print("Invalid choice.")
@@ -892,31 +2470,22 @@ def edit_student_info():
     print("EDIT STUDENT INFORMATION")
     print("=" * 50)
 
-    print("\nREGISTERED STUDENTS (Organized by Section):")
-    print("-" * 60)
-
-    sections_dict = {}
-    for student_num, info in dict_student.items():
-        section = info['section']
-        if section not in sections_dict:
-            sections_dict[section] = []
-        sections_dict[section].append((info['name'], student_num))
-
-    for section, students in sorted(sections_dict.items()):
-        print(f"\n{section} SECTION:")
-        for name, student_num in sorted(students, key=lambda x: x[0]):
-            print(f"  {name} - {student_num}")
+    student_num = select_student("\nEnter student number or name to edit (B to browse): ")
 
-    student_num = input("\nEnter student number to edit: ")
+    if student_num is None:
+        return
 
     if student_num not in dict_student:
         print("Student not found!")
         input("Press Enter to return to main menu...")
         return
 
-    current_info = dict_student[student_num]
-
     while True:
+        if student_num not in dict_student:
+            print("Student not found!")
+            break
+        current_info = dict_student[student_num]
+
         print(f"\n" + "=" * 40)
         print(f"Editing: {current_info['name']}")
         print("=" * 40)
@@ -944,21 +2513,9 @@ def edit_student_info():
                     print("Name must be between 3 and 50 characters.")
                     continue
 
-                dict_student[student_num]['name'] = new_name.upper()
-
-                for i, row in enumerate(students_dataset):
-                    if row[0] == student_num:
-                        students_dataset[i][1] = new_name.upper()
-                        break
-
-                if student_num in dict_grades:
-                    dict_grades[student_num]['name'] = new_name.upper()
-                    for i, row in enumerate(grades_dataset):
-                        if row[0] == student_num:
-                            grades_dataset[i][1] = new_name.upper()
+                update_student_info(student_num, name=new_name.upper())
 
                 print(f"Name updated to: {new_name.upper()}")
-                current_info['name'] = new_name.upper()
                 save_to_files()
                 break
 
@@ -968,21 +2525,9 @@ def edit_student_info():
                     f"Current section: {current_info['section']}\nEnter new section (format: ABCD-12A3 or BSE1-12A3): ").upper()
 
                 if validate_section(new_section):
-                    dict_student[student_num]['section'] = new_section
-
-                    for i, row in enumerate(students_dataset):
-                        if row[0] == student_num:
-                            students_dataset[i][2] = new_section
-                            break
-
-                    if student_num in dict_grades:
-                        dict_grades[student_num]['section'] = new_section
-                        for i, row in enumerate(grades_dataset):
-                            if row[0] == student_num:
-                                grades_dataset[i][2] = new_section
+                    update_student_info(student_num, section=new_section)
 
                     print(f"Section updated to: {new_section}")
-                    current_info['section'] = new_section
                     save_to_files()
                     break
                 else:
@@ -992,7 +2537,7 @@ def edit_student_info():
             while True:
                 new_student_num = input(f"Current student number: {student_num}\nEnter new student number: ")
 
-                if len(new_student_num) != 6 or not new_student_num.isdigit():
+                if not validate_student_number(new_student_num):
                     print("Student number must be 6 digits.")
                     continue
 
@@ -1000,22 +2545,10 @@ def edit_student_info():
                     print("This student number is already taken.")
                     continue
 
-                dict_student[new_student_num] = dict_student[student_num]
-                del dict_student[student_num]
-
-                for i, row in enumerate(students_dataset):
-                    if row[0] == student_num:
-                        students_dataset[i][0] = new_student_num
-                        break
-
-                if student_num in dict_grades:
-                    dict_grades[new_student_num] = dict_grades[student_num]
-                    del dict_grades[student_num]
-                    dict_grades[new_student_num]['name'] = current_info['name']
+                if new_student_num == student_num:
+                    break
 
-                    for i, row in enumerate(grades_dataset):
-                        if row[0] == student_num:
-                            grades_dataset[i][0] = new_student_num
+                change_student_number(student_num, new_student_num)
 
                 print(f"Student number updated from {student_num} to {new_student_num}")
                 student_num = new_student_num
@@ -1033,7 +2566,10 @@ def edit_student_info():
 
 
 def main_menu():
-    load_from_files()
+    load_from_files(defer_grades=True)
+    if load_stats['rows']:
+        print(f"Loaded {load_stats['rows']:,} rows in {load_stats['seconds']:.2f}s "
+              f"({load_stats['rows_per_second']:,.0f} rows/s)")
 
     while True:
         print("\n" + "=" * 50)
@@ -1052,11 +2588,13 @@ def main_menu():
             print("Invalid input. Please enter a number.")
             continue
 
+        profiler = start_profile(choice)
+
         if choice == 1:
             while True:
                 student_num = input("\nEnter Student Number (6 digits): ")
 
-                if len(student_num) != 6 or not student_num.isdigit():
+                if not validate_student_number(student_num):
                     print("Invalid input. Student number must be 6 digits.")
                     continue
                 if student_num in dict_student:
@@ -1076,7 +2614,7 @@ def main_menu():
                     print("Name must be between 3 and 50 characters.")
                     continue
 
-                if any(char.isdigit() for char in name):
+                if contains_digit(name):
                     print("Error: Name cannot contain numbers.")
                     continue
                 break
@@ -1104,11 +2642,708 @@ def main_menu():
             print("\nThank you for using Student Grade Evaluation System!")
             print("Exiting program...")
             save_to_files()
+            if change_log_records and grades_loaded:
+                compact_files()
+            stop_profile(profiler, choice)
+            print_trace_summary()
             break
 
         else:
             print("Invalid choice. Please select 1-5.")
 
+        stop_profile(profiler, choice)
+
+
+HISTOGRAM_BUCKETS = [(65, 70), (70, 75), (75, 80), (80, 85), (85, 90), (90, 95), (95, 101)]
+SCHOOL_WIDE = 'ALL SECTIONS'
+
+
+class GradeStats:
+    __slots__ = ('count', 'mean', 'm2', 'passed', 'counts', 'histogram', 'top', 'bottom', 'rank_size')
+
+    def __init__(self, rank_size):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.passed = 0
+        self.counts = {}
+        self.histogram = [0] * len(HISTOGRAM_BUCKETS)
+        self.top = []
+        self.bottom = []
+        self.rank_size = rank_size
+
+    def add(self, grade, student_num, name):
+        self.count += 1
+        delta = grade - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (grade - self.mean)
+
+        if grade >= 75:
+            self.passed += 1
+
+        key = round(grade * 100)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+        for i, (low, high) in enumerate(HISTOGRAM_BUCKETS):
+            if low <= grade < high:
+                self.histogram[i] += 1
+                break
+
+        if self.rank_size:
+            entry = (grade, student_num, name)
+            if len(self.top) < self.rank_size:
+                heapq.heappush(self.top, entry)
+                heapq.heappush(self.bottom, (-grade, student_num, name))
+            else:
+                heapq.heappushpop(self.top, entry)
+                heapq.heappushpop(self.bottom, (-grade, student_num, name))
+
+    def median(self):
+        if not self.count:
+            return 0
+        wanted = [(self.count - 1) // 2, self.count // 2]
+        values = []
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            while wanted and wanted[0] < seen:
+                values.append(key / 100)
+                wanted.pop(0)
+            if not wanted:
+                break
+        return sum(values) / len(values)
+
+    def std_dev(self):
+        return math.sqrt(self.m2 / self.count) if self.count else 0
+
+    def pass_rate(self):
+        return self.passed / self.count * 100 if self.count else 0
+
+    def top_students(self):
+        return sorted(self.top, reverse=True)
+
+    def bottom_students(self):
+        return sorted(((-grade, num, name) for grade, num, name in self.bottom))
+
+
+@instrumented
+def compute_class_statistics(section=None, rank_size=5):
+    stats = {}
+    scopes = (None,) if section is not None else (None, SCHOOL_WIDE)
+
+    for row in grades_dataset:
+        if section is not None and row[2] != section:
+            continue
+
+        grade = parse_grade(row[8])
+        if grade <= 0:
+            continue
+
+        for scope in scopes:
+            group = (scope or row[2], row[3])
+            group_stats = stats.get(group)
+            if group_stats is None:
+                group_stats = stats[group] = GradeStats(rank_size)
+            group_stats.add(grade, row[0], row[1])
+
+    return dict(sorted(stats.items(), key=lambda item: (item[0][0] == SCHOOL_WIDE, item[0])))
+
+
+def class_statistics_datasets(stats):
+    summary = tablib.Dataset()
+    summary.headers = (['Section', 'Subject', 'Students', 'Mean', 'Median', 'Std Dev', 'Pass Rate'] +
+                       [f"{low}-{high - 1}" for low, high in HISTOGRAM_BUCKETS])
+
+    rankings = tablib.Dataset()
+    rankings.headers = ['Section', 'Subject', 'Ranking', 'Rank', 'Student Number', 'Name', 'Final Grade']
+
+    for (section, subject), group_stats in stats.items():
+        summary.append([section, subject, group_stats.count, round(group_stats.mean, 2), round(group_stats.median(), 2),
+                        round(group_stats.std_dev(), 2), round(group_stats.pass_rate(), 2)] + group_stats.histogram)
+
+        for label, students in (('TOP', group_stats.top_students()), ('BOTTOM', group_stats.bottom_students())):
+            for rank, (grade, student_num, name) in enumerate(students, 1):
+                rankings.append([section, subject, label, rank, student_num, name, round(grade, 2)])
+
+    return summary, rankings
+
+
+def export_dataset(dataset, path):
+    file_format = os.path.splitext(path)[1].lstrip('.').lower() or 'csv'
+    content = dataset.export(file_format)
+    if isinstance(content, bytes):
+        with open(path, 'wb') as f:
+            f.write(content)
+    else:
+        with open(path, 'w', newline='') as f:
+            f.write(content)
+
+
+def print_class_statistics(stats):
+    print(f"\n{'SECTION':<14} {'SUBJECT':<13} {'N':>6} {'MEAN':>7} {'MEDIAN':>7} {'STDEV':>6} {'PASS %':>7}")
+    print("-" * 66)
+    for (section, subject), group_stats in stats.items():
+        print(f"{section:<14} {subject:<13} {group_stats.count:>6} {group_stats.mean:>7.2f} "
+              f"{group_stats.median():>7.2f} {group_stats.std_dev():>6.2f} {group_stats.pass_rate():>6.1f}%")
+
+
+REPORT_FORMATS = ['csv', 'xlsx', 'json']
+REPORT_HEADERS = [header for header in GRADE_HEADERS if header != 'Section']
+MANIFEST_FILE = 'manifest.json'
+
+
+def partition_by_section():
+    sections = {}
+    for row in grades_dataset:
+        sections.setdefault(row[2], []).append(row[:2] + row[3:])
+    return sections
+
+
+def render_section_report(section, rows, formats, output_dir):
+    rows.sort(key=lambda row: (row[1], row[0], SUBJECT_POSITIONS.get(row[2], len(subjects))))
+
+    report = tablib.Dataset(*rows, headers=REPORT_HEADERS, title=section)
+
+    files = []
+    for file_format in formats:
+        path = os.path.join(output_dir, f"{section}.{file_format}")
+        export_dataset(report, path)
+        files.append({'format': file_format, 'file': os.path.basename(path), 'bytes': os.path.getsize(path)})
+
+    return {'section': section, 'students': len({row[0] for row in rows}), 'rows': len(rows), 'files': files}
+
+
+@instrumented
+def export_reports(output_dir, formats=REPORT_FORMATS, workers=None):
+    os.makedirs(output_dir, exist_ok=True)
+
+    sections = sorted(partition_by_section().items(), key=lambda item: len(item[1]), reverse=True)
+    jobs = ([section for section, _ in sections], [rows for _, rows in sections],
+            [formats] * len(sections), [output_dir] * len(sections))
+
+    if workers == 1 or len(sections) < 2:
+        reports = list(map(render_section_report, *jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(render_section_report, *jobs))
+
+    reports.sort(key=lambda report: report['section'])
+    manifest = {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'formats': list(formats),
+        'sections': reports,
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return reports
+
+
+def normalize_student_number(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip() if value is not None else ""
+
+
+def read_sheet_rows(path):
+    if path.lower().endswith(('.xlsx', '.xls')):
+        with open(path, 'rb') as f:
+            dataset = tablib.Dataset().load(f, format=path.rsplit('.', 1)[1].lower())
+        yield dataset.headers
+        yield from dataset
+    else:
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            yield from csv.reader(f)
+
+
+def validate_grade_sheet(path, quarter):
+    entries = {}
+    errors = []
+
+    rows = read_sheet_rows(path)
+    header = next(rows, None)
+    if not header:
+        return entries, [(1, "Sheet is empty.")]
+
+    columns = [str(column).strip().upper() if column is not None else "" for column in header]
+    if 'STUDENT NUMBER' not in columns:
+        return entries, [(1, "Missing 'Student Number' column.")]
+
+    number_column = columns.index('STUDENT NUMBER')
+    subject_columns = [(subject, columns.index(subject)) for subject in subjects if subject in columns]
+    if not subject_columns:
+        return entries, [(1, f"No subject columns found. Expected any of: {', '.join(subjects)}.")]
+
+    lines = []
+    student_nums = []
+    sheet_rows = []
+    for line, row in enumerate(rows, 2):
+        if not row or all(cell in (None, "") for cell in row):
+            continue
+
+        lines.append(line)
+        student_nums.append(normalize_student_number(row[number_column] if number_column < len(row) else None))
+        sheet_rows.append(row)
+
+    for line, student_num, row, number_valid in zip(lines, student_nums, sheet_rows,
+                                                    validate_student_numbers(student_nums)):
+        if not number_valid:
+            errors.append((line, f"Invalid student number '{student_num}'. Student number must be 6 digits."))
+            continue
+        if student_num not in dict_student:
+            errors.append((line, f"Student {student_num} is not registered."))
+            continue
+        if student_num in entries:
+            errors.append((line, f"Duplicate row for student {student_num}."))
+            continue
+
+        quarter_grades = {}
+        row_errors = []
+        for subject, column in subject_columns:
+            value = row[column] if column < len(row) else None
+            if value in (None, ""):
+                continue
+            try:
+                grade = float(value)
+            except (TypeError, ValueError):
+                row_errors.append(f"{subject}: '{value}' is not a valid number")
+                continue
+            if math.isnan(grade) or grade < 65 or grade > 100:
+                row_errors.append(f"{subject}: grade must be between 65 and 100")
+                continue
+            quarter_grades[subject] = grade
+
+        if row_errors:
+            errors.append((line, "; ".join(row_errors) + "."))
+        elif not quarter_grades:
+            errors.append((line, f"No {quarter} grades given for student {student_num}."))
+        else:
+            entries[student_num] = (line, quarter_grades)
+
+    return entries, errors
+
+
+def expand_sheet_paths(paths):
+    sheets = []
+    for path in paths:
+        if os.path.isdir(path):
+            sheets.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                 if name.lower().endswith(('.csv', '.xlsx', '.xls'))))
+        else:
+            sheets.append(path)
+    return sheets
+
+
+def read_grade_sheet(path, quarter):
+    try:
+        return validate_grade_sheet(path, quarter)
+    except Exception as e:
+        return {}, [(None, f"Could not read sheet: {e}.")]
+
+
+@instrumented
+def import_grade_files(paths, quarter, skip_invalid=False, workers=None):
+    entries = {}
+    sources = {}
+    errors = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for path, (sheet_entries, sheet_errors) in zip(paths, executor.map(read_grade_sheet, paths,
+                                                                           [quarter] * len(paths))):
+            errors.extend((path, line, message) for line, message in sheet_errors)
+
+            for student_num, (line, quarter_grades) in sheet_entries.items():
+                merged = entries.setdefault(student_num, {})
+                conflicts = []
+                for subject, grade in quarter_grades.items():
+                    if subject not in merged:
+                        merged[subject] = grade
+                        sources[student_num, subject] = (path, line)
+                    elif merged[subject] != grade:
+                        source_path, source_line = sources[student_num, subject]
+                        conflicts.append(f"{subject} {grade:g} conflicts with {merged[subject]:g} "
+                                         f"in {source_path} row {source_line}")
+
+                if conflicts:
+                    errors.append((path, line, f"Student {student_num}: {'; '.join(conflicts)}."))
+
+    if errors and not skip_invalid:
+        return 0, errors
+
+    if entries:
+        apply_quarter_grade_batch(quarter, entries)
+        save_to_files()
+
+    return len(entries), errors
+
+
+def validate_registration_sheet(path):
+    entries = []
+    errors = []
+
+    rows = read_sheet_rows(path)
+    header = next(rows, None)
+    if not header:
+        return entries, [(1, "Sheet is empty.")]
+
+    columns = [str(column).strip().upper() if column is not None else "" for column in header]
+    missing = [column for column in STUDENT_HEADERS if column.upper() not in columns]
+    if missing:
+        return entries, [(1, f"Missing column(s): {', '.join(missing)}.")]
+
+    number_column, name_column, section_column = [columns.index(column.upper()) for column in STUDENT_HEADERS]
+
+    lines = []
+    student_nums = []
+    names = []
+    sections = []
+    for line, row in enumerate(rows, 2):
+        if not row or all(cell in (None, "") for cell in row):
+            continue
+
+        cells = [row[column] if column < len(row) else None for column in (number_column, name_column, section_column)]
+        lines.append(line)
+        student_nums.append(normalize_student_number(cells[0]))
+        names.append(str(cells[1]).strip() if cells[1] is not None else "")
+        sections.append(str(cells[2]).strip().upper() if cells[2] is not None else "")
+
+    number_results = validate_student_numbers(student_nums)
+    name_results = validate_names(names)
+    section_results = validate_sections(sections)
+    seen = set()
+
+    for line, student_num, name, section, number_valid, (name_valid, name_error), section_valid in zip(
+            lines, student_nums, names, sections, number_results, name_results, section_results):
+        row_errors = []
+        if not number_valid:
+            row_errors.append(f"Invalid student number '{student_num}'. Student number must be 6 digits.")
+        elif student_num in dict_student:
+            row_errors.append(f"Student number {student_num} has already been registered.")
+        elif student_num in seen:
+            row_errors.append(f"Duplicate row for student {student_num}.")
+
+        if not name_valid:
+            row_errors.append(name_error)
+        elif len(name) < 3 or len(name) > 50:
+            row_errors.append("Name must be between 3 and 50 characters.")
+
+        if not section_valid:
+            row_errors.append(f"Invalid section '{section}'. Use format: ABCD-12A3 or BSE1-12A3.")
+
+        if student_num:
+            seen.add(student_num)
+
+        if row_errors:
+            errors.append((line, " ".join(row_errors)))
+        else:
+            entries.append((student_num, name, section))
+
+    return entries, errors
+
+
+@instrumented
+def register_students(path, skip_invalid=False):
+    entries, errors = validate_registration_sheet(path)
+
+    if errors and not skip_invalid:
+        return 0, errors
+
+    for student_num, name, section in entries:
+        add_student(name, student_num, section)
+
+    if entries:
+        save_to_files()
+
+    return len(entries), errors
+
+
+def validate_renumber_sheet(path):
+    entries = []
+    errors = []
+
+    rows = read_sheet_rows(path)
+    header = next(rows, None)
+    if not header:
+        return entries, [(1, "Sheet is empty.")]
+
+    columns = [str(column).strip().upper() if column is not None else "" for column in header]
+    missing = [column for column in ('STUDENT NUMBER', 'NEW STUDENT NUMBER') if column not in columns]
+    if missing:
+        return entries, [(1, f"Missing column(s): {', '.join(missing)}.")]
+
+    old_column = columns.index('STUDENT NUMBER')
+    new_column = columns.index('NEW STUDENT NUMBER')
+    renamed = set()
+    taken = set()
+
+    lines = []
+    old_nums = []
+    new_nums = []
+    for line, row in enumerate(rows, 2):
+        if not row or all(cell in (None, "") for cell in row):
+            continue
+
+        lines.append(line)
+        old_nums.append(normalize_student_number(row[old_column] if old_column < len(row) else None))
+        new_nums.append(normalize_student_number(row[new_column] if new_column < len(row) else None))
+
+    for line, old_num, new_num, new_valid in zip(lines, old_nums, new_nums, validate_student_numbers(new_nums)):
+        if old_num not in dict_student:
+            errors.append((line, f"Student {old_num} is not registered."))
+        elif old_num in renamed:
+            errors.append((line, f"Duplicate row for student {old_num}."))
+        elif not new_valid:
+            errors.append((line, f"Invalid student number '{new_num}'. Student number must be 6 digits."))
+        elif new_num in dict_student or new_num in taken:
+            errors.append((line, f"Student number {new_num} is already taken."))
+        else:
+            entries.append((old_num, new_num))
+
+        renamed.add(old_num)
+        taken.add(new_num)
+
+    return entries, errors
+
+
+@instrumented
+def renumber_students(path, skip_invalid=False):
+    entries, errors = validate_renumber_sheet(path)
+
+    if errors and not skip_invalid:
+        return 0, errors
+
+    for old_num, new_num in entries:
+        change_student_number(old_num, new_num)
+
+    if entries:
+        save_to_files()
+
+    return len(entries), errors
+
+
+def main(argv=None):
+    global storage, trace_path, profile_action
+
+    parser = argparse.ArgumentParser(description="Student Grade Evaluation System")
+    parser.add_argument('--storage', choices=['csv', 'sqlite', 'binary'],
+                        help="Storage backend (default: $SGES_STORAGE or csv)")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="Record call counts, timings and bytes written to this JSON-lines file "
+                             "(default: $SGES_TRACE)")
+    parser.add_argument('--profile-action', type=int, metavar='N',
+                        help="Run main menu choice N under cProfile (default: $SGES_PROFILE)")
+    commands = parser.add_subparsers(dest='command')
+
+    recompute_parser = commands.add_parser('recompute', help="Recompute final grades, averages and remarks")
+    recompute_parser.add_argument('--section', help="Only recompute students in this section")
+
+    import_parser = commands.add_parser('import-grades', help="Import one quarter's grades from CSV/Excel sheets")
+    import_parser.add_argument('sheets', nargs='+',
+                               help="CSV or XLSX files (or directories of them) with a 'Student Number' column "
+                                    "and subject columns")
+    import_parser.add_argument('--quarter', required=True, choices=quarters)
+    import_parser.add_argument('--skip-invalid', action='store_true',
+                               help="Import the valid rows even if some rows have errors")
+    import_parser.add_argument('--workers', type=int, help="Sheets parsed in parallel (default: Python's default)")
+
+    register_parser = commands.add_parser('register-students', help="Register students in bulk from a CSV/Excel sheet")
+    register_parser.add_argument('sheet', help="CSV or XLSX file with 'Student Number', 'Name' and 'Section' columns")
+    register_parser.add_argument('--skip-invalid', action='store_true',
+                                 help="Register the valid rows even if some rows have errors")
+    register_parser.add_argument('--report', help="Write the rejected rows to this file (.csv, .json, .xlsx, ...)")
+
+    section_parser = commands.add_parser('rename-section', help="Move every student in a section to a new section code")
+    section_parser.add_argument('old_section')
+    section_parser.add_argument('new_section')
+
+    renumber_parser = commands.add_parser('renumber-students', help="Reassign student numbers in bulk from a sheet")
+    renumber_parser.add_argument('sheet', help="CSV or XLSX file with 'Student Number' and 'New Student Number' columns")
+    renumber_parser.add_argument('--skip-invalid', action='store_true',
+                                 help="Apply the valid rows even if some rows have errors")
+
+    analytics_parser = commands.add_parser('analytics', help="Class statistics per section and subject")
+    analytics_parser.add_argument('--section', help="Only report on this section")
+    analytics_parser.add_argument('--top', type=int, default=5, help="Size of the top/bottom rankings (default: 5)")
+    analytics_parser.add_argument('--export', help="Write the statistics to this file (.csv, .json, .xlsx, ...); "
+                                                   "rankings go to <name>_rankings.<ext>")
+
+    reports_parser = commands.add_parser('export-reports', help="Write one grade report per section plus a manifest")
+    reports_parser.add_argument('output_dir', help="Directory to write the reports into")
+    reports_parser.add_argument('--formats', default=','.join(REPORT_FORMATS),
+                                help=f"Comma-separated report formats (default: {','.join(REPORT_FORMATS)})")
+    reports_parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU core)")
+
+    convert_parser = commands.add_parser('convert-snapshot', help="Convert between the CSV and binary snapshots")
+    convert_parser.add_argument('target', choices=['binary', 'csv'],
+                                help=f"'binary' writes {BINARY_SNAPSHOT_FILE} from students.csv/grades.csv, "
+                                     f"'csv' writes them back from {BINARY_SNAPSHOT_FILE}")
+
+    migrate_parser = commands.add_parser('migrate-sqlite', help="Import students.csv/grades.csv into SQLite")
+    migrate_parser.add_argument('--db', default=SQLITE_FILE, help=f"SQLite database file (default: {SQLITE_FILE})")
+
+    args = parser.parse_args(argv)
+
+    if args.storage:
+        storage = make_storage(args.storage)
+    if args.trace:
+        trace_path = args.trace
+    if args.profile_action is not None:
+        profile_action = args.profile_action
+
+    try:
+        return run_command(args)
+    except StorageError as e:
+        print(f"Error: {e}")
+        return 1
+
+
+def run_command(args):
+    if args.command is None:
+        main_menu()
+
+    elif args.command == 'recompute':
+        load_from_files()
+
+        student_nums = None
+        if args.section:
+            section = args.section.upper()
+            student_nums = [num for _, num in section_index.get(section, [])]
+
+        started = time.perf_counter()
+        results = recompute_grades(student_nums)
+        elapsed = time.perf_counter() - started
+        compact_files()
+
+        remarks = Counter(remarks for _, _, remarks in results.values())
+        print(f"Recomputed {len(results):,} students in {elapsed * 1000:.1f} ms "
+              f"({remarks['PASSED']:,} PASSED, {remarks['FAILED']:,} FAILED, "
+              f"{remarks[None]:,} without a final average)")
+
+    elif args.command == 'import-grades':
+        load_from_files()
+
+        sheets = expand_sheet_paths(args.sheets)
+        if not sheets:
+            print("No CSV or Excel sheets found.")
+            return 1
+
+        started = time.perf_counter()
+        imported, errors = import_grade_files(sheets, args.quarter, args.skip_invalid, args.workers)
+        elapsed = time.perf_counter() - started
+
+        for path, line, message in errors:
+            prefix = f"{path}: " if len(sheets) > 1 else ""
+            print(f"{prefix}Row {line}: {message}" if line is not None else f"{prefix}{message}")
+
+        if errors and not args.skip_invalid:
+            print(f"\n{len(errors):,} invalid rows. No grades were imported "
+                  f"(fix the sheet or use --skip-invalid).")
+            return 1
+
+        print(f"\nImported {args.quarter.upper()} grades for {imported:,} students from {len(sheets):,} sheets "
+              f"in {elapsed:.2f}s ({len(errors):,} rows skipped).")
+
+    elif args.command == 'register-students':
+        load_from_files(defer_grades=True)
+
+        started = time.perf_counter()
+        registered, errors = register_students(args.sheet, args.skip_invalid)
+        elapsed = time.perf_counter() - started
+
+        for line, message in errors:
+            print(f"Row {line}: {message}")
+
+        if args.report:
+            report = tablib.Dataset(*errors, headers=['Row', 'Error'])
+            export_dataset(report, args.report)
+            print(f"\nWrote {len(errors):,} rejected rows to {args.report}.")
+
+        if errors and not args.skip_invalid:
+            print(f"\n{len(errors):,} invalid rows. No students were registered "
+                  f"(fix the sheet or use --skip-invalid).")
+            return 1
+
+        print(f"\nRegistered {registered:,} students in {elapsed:.2f}s ({len(errors):,} rows skipped).")
+
+    elif args.command == 'rename-section':
+        load_from_files(defer_grades=True)
+
+        old_section, new_section = args.old_section.upper(), args.new_section.upper()
+        if not validate_section(new_section):
+            print("Invalid format. Use format: ABCD-12A3 or BSE1-12A3")
+            return 1
+
+        if old_section == new_section:
+            print("The new section is the same as the current one.")
+            return 1
+
+        moved = move_section(old_section, new_section)
+        if not moved:
+            print(f"No students found in section {old_section}.")
+            return 1
+
+        save_to_files()
+        print(f"Moved {moved:,} students from {old_section} to {new_section}.")
+
+    elif args.command == 'renumber-students':
+        load_from_files(defer_grades=True)
+
+        renumbered, errors = renumber_students(args.sheet, args.skip_invalid)
+
+        for line, message in errors:
+            print(f"Row {line}: {message}")
+
+        if errors and not args.skip_invalid:
+            print(f"\n{len(errors):,} invalid rows. No student numbers were changed "
+                  f"(fix the sheet or use --skip-invalid).")
+            return 1
+
+        print(f"\nReassigned {renumbered:,} student numbers ({len(errors):,} rows skipped).")
+
+    elif args.command == 'analytics':
+        load_from_files()
+
+        stats = compute_class_statistics(args.section.upper() if args.section else None, args.top)
+        if not stats:
+            print("No computed final grades yet.")
+            return 1
+
+        print_class_statistics(stats)
+
+        if args.export:
+            summary, rankings = class_statistics_datasets(stats)
+            stem, extension = os.path.splitext(args.export)
+            export_dataset(summary, args.export)
+            export_dataset(rankings, f"{stem}_rankings{extension}")
+            print(f"\nExported statistics to {args.export} and rankings to {stem}_rankings{extension}.")
+
+    elif args.command == 'export-reports':
+        load_from_files()
+
+        formats = [file_format.strip().lower() for file_format in args.formats.split(',') if file_format.strip()]
+        if not grades_dataset:
+            print("No grades recorded yet.")
+            return 1
+
+        started = time.perf_counter()
+        reports = export_reports(args.output_dir, formats, args.workers)
+        elapsed = time.perf_counter() - started
+
+        print(f"Exported {len(reports):,} section reports ({', '.join(formats)}) to {args.output_dir} "
+              f"in {elapsed:.2f}s. See {os.path.join(args.output_dir, MANIFEST_FILE)}.")
+
+    elif args.command == 'convert-snapshot':
+        student_count, grade_count = convert_snapshot(args.target)
+        written = BINARY_SNAPSHOT_FILE if args.target == 'binary' else 'students.csv and grades.csv'
+        print(f"Wrote {student_count:,} students and {grade_count:,} grade rows to {written}.")
+        if args.target == 'binary':
+            print("Run with --storage binary (or SGES_STORAGE=binary) to use it.")
+
+    elif args.command == 'migrate-sqlite':
+        student_count, grade_count = migrate_to_sqlite(args.db)
+        print(f"Migrated {student_count:,} students and {grade_count:,} grade rows into {args.db}.")
+        print("Run with --storage sqlite (or SGES_STORAGE=sqlite) to use it.")
+
 
 if __name__ == "__main__":
-    main_menu()
+    raise SystemExit(main())
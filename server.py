@@ -0,0 +1,212 @@
+import argparse
+import json
+import math
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+import main
+
+store_lock = threading.RLock()
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def student_report(student_num):
+    info = main.dict_student[student_num]
+    report = {
+        'student_number': student_num,
+        'name': info['name'],
+        'section': info['section'],
+        'subjects': {},
+        'final_average': None,
+        'remarks': None,
+    }
+
+    grades = main.dict_grades.get(student_num)
+    if grades is None:
+        return report
+
+    for subject in main.subjects:
+        if subject in grades:
+            subj_grades = grades[subject]
+            report['subjects'][subject] = {quarter: subj_grades.get(quarter) for quarter in main.quarters}
+            report['subjects'][subject]['final_grade'] = round(grades.subject_final(subject), 2)
+
+    if 'final_average' in grades:
+        report['final_average'] = grades['final_average']
+        report['remarks'] = grades['remarks']
+    return report
+
+
+def section_roster(section):
+    return [{'student_number': student_num, 'name': name} for name, student_num in main.section_index.get(section, [])]
+
+
+def register_student(payload):
+    student_num = str(payload.get('student_number', '')).strip()
+    name = str(payload.get('name', '')).strip()
+    section = str(payload.get('section', '')).strip().upper()
+
+    if not main.validate_student_number(student_num):
+        raise ApiError(400, "Student number must be 6 digits.")
+
+    is_valid, error_msg = main.validate_name_format(name)
+    if not is_valid:
+        raise ApiError(400, error_msg)
+    if len(name) < 3 or len(name) > 50:
+        raise ApiError(400, "Name must be between 3 and 50 characters.")
+    if not main.validate_section(section):
+        raise ApiError(400, "Invalid section format. Use format: ABCD-12A3 or BSE1-12A3")
+
+    with store_lock:
+        if student_num in main.dict_student:
+            raise ApiError(409, "This student number has already been registered.")
+        main.store_student(name, student_num, section)
+        return student_report(student_num)
+
+
+def submit_grades(payload):
+    student_num = str(payload.get('student_number', '')).strip()
+    quarter = str(payload.get('quarter', '')).strip().lower()
+    grades = payload.get('grades')
+
+    if quarter not in main.quarters:
+        raise ApiError(400, f"Quarter must be one of: {', '.join(main.quarters)}.")
+    if not isinstance(grades, dict) or not grades:
+        raise ApiError(400, "Grades must be an object mapping subjects to grades.")
+
+    quarter_grades = {}
+    for subject, value in grades.items():
+        subject = str(subject).upper()
+        if subject not in main.subjects:
+            raise ApiError(400, f"Unknown subject {subject}.")
+        try:
+            grade = float(value)
+        except (TypeError, ValueError):
+            raise ApiError(400, f"{subject}: please enter a valid number.")
+        if math.isnan(grade) or grade < 65 or grade > 100:
+            raise ApiError(400, f"{subject}: grade must be between 65 and 100.")
+        quarter_grades[subject] = grade
+
+    with store_lock:
+        if student_num not in main.dict_student:
+            raise ApiError(404, "Student not found!")
+        main.apply_quarter_grades(student_num, quarter, quarter_grades)
+        main.save_to_files()
+        return student_report(student_num)
+
+
+class GradeBookHandler(BaseHTTPRequestHandler):
+    server_version = "StudentGradeEvaluation/1.0"
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            raise ApiError(400, "Content-Length must be a whole number.")
+        if length < 0:
+            raise ApiError(400, "Content-Length must be a whole number.")
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise ApiError(400, "Request body must be valid JSON.")
+        if not isinstance(payload, dict):
+            raise ApiError(400, "Request body must be a JSON object.")
+        return payload
+
+    def handle_request(self, route):
+        try:
+            status, body = route([unquote(part) for part in urlparse(self.path).path.strip('/').split('/') if part])
+        except ApiError as e:
+            status, body = e.status, {'error': e.message}
+        except Exception:
+            self.log_error("%s", traceback.format_exc())
+            status, body = 500, {'error': "Internal server error."}
+        self.send_json(status, body)
+
+    def do_GET(self):
+        self.handle_request(self.route_get)
+
+    def do_POST(self):
+        self.handle_request(self.route_post)
+
+    def route_get(self, parts):
+        with store_lock:
+            if parts == ['sections']:
+                return 200, [{'section': section, 'students': len(main.section_index[section])}
+                             for section in main.sorted_sections]
+
+            if len(parts) == 2 and parts[0] == 'sections':
+                section = parts[1].upper()
+                if section not in main.section_index:
+                    raise ApiError(404, f"No students found in section {section}.")
+                return 200, {'section': section, 'students': section_roster(section)}
+
+            if len(parts) == 3 and parts[0] == 'sections' and parts[2] == 'grades':
+                section = parts[1].upper()
+                if section not in main.section_index:
+                    raise ApiError(404, f"No students found in section {section}.")
+                return 200, {'section': section,
+                             'students': [student_report(num) for _, num in main.section_index[section]]}
+
+            if len(parts) == 2 and parts[0] == 'students':
+                if parts[1] not in main.dict_student:
+                    raise ApiError(404, "Student not found!")
+                return 200, student_report(parts[1])
+
+        raise ApiError(404, "Not found.")
+
+    def route_post(self, parts):
+        if parts == ['students']:
+            return 201, register_student(self.read_json())
+        if parts == ['grades']:
+            return 200, submit_grades(self.read_json())
+        raise ApiError(404, "Not found.")
+
+
+def serve(host='127.0.0.1', port=8000):
+    main.load_from_files()
+    server = ThreadingHTTPServer((host, port), GradeBookHandler)
+    print(f"Serving {len(main.dict_student):,} students on http://{host}:{port} (Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with store_lock:
+            main.save_to_files()
+            if main.change_log_records:
+                main.compact_files()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the grade book as a local HTTP/JSON API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--storage', choices=['csv', 'sqlite', 'binary'], help="Storage backend (default: $SGES_STORAGE or csv)")
+    args = parser.parse_args()
+
+    if args.storage:
+        main.storage = main.make_storage(args.storage)
+    try:
+        serve(args.host, args.port)
+    except main.StorageError as e:
+        print(f"Error: {e}")
+        raise SystemExit(1)
@@ -0,0 +1,85 @@
+import math
+import random
+import unittest
+from unittest import mock
+
+import main
+
+RECORDS = 20000
+
+
+class GradeEngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.saved = dict(main.dict_grades), main.grade_matrix[:], main.matrix_grade_rows[:]
+        main.dict_grades.clear()
+        del main.grade_matrix[:]
+        del main.matrix_grade_rows[:]
+
+        rng = random.Random(6)
+        for i in range(RECORDS):
+            record = main.dict_grades[f"{i:06d}"] = main.StudentRecord("DELA CRUZ, JUAN P.", "BSCS-12M1")
+            for subject in main.subjects:
+                if rng.random() < 0.1:
+                    continue
+                for quarter in main.quarters:
+                    if rng.random() < 0.15:
+                        continue
+                    record.set_grade(subject, quarter, round(rng.uniform(65, 100), rng.choice([1, 2, 15])))
+
+        cls.expected = {}
+        for student_num, record in main.dict_grades.items():
+            finals = [main.calculate_final_subject_grade(record, subject) for subject in main.subjects]
+            final_avg = main.calculate_final_average(record)
+            remarks = ("PASSED" if final_avg >= 75 else "FAILED") if final_avg > 0 else None
+            cls.expected[student_num] = (finals, final_avg, remarks)
+
+    @classmethod
+    def tearDownClass(cls):
+        dict_grades, grade_matrix, matrix_grade_rows = cls.saved
+        main.dict_grades.clear()
+        main.dict_grades.update(dict_grades)
+        main.grade_matrix[:] = grade_matrix
+        main.matrix_grade_rows[:] = matrix_grade_rows
+
+    def assert_matches_per_student_functions(self, results):
+        self.assertEqual(len(results), RECORDS)
+        mismatches = [student_num for student_num, expected in self.expected.items()
+                      if results[student_num] != expected]
+        self.assertEqual(mismatches, [])
+
+    def test_record_summaries(self):
+        for student_num, (finals, final_avg, _) in self.expected.items():
+            record = main.dict_grades[student_num]
+            record.derived = None
+            summary = record.summary()
+            self.assertEqual((summary.subject_finals, summary.final_average), (finals, final_avg), student_num)
+
+    @unittest.skipIf(main.numpy is None, "numpy is not installed")
+    def test_numpy_engine(self):
+        self.assert_matches_per_student_functions(main.compute_grade_results())
+
+    def test_pure_python_engine(self):
+        with mock.patch.object(main, 'numpy', None):
+            self.assert_matches_per_student_functions(main.compute_grade_results())
+
+    def test_incomplete_subjects_are_left_out_of_the_average(self):
+        record = main.dict_grades["900000"] = main.StudentRecord("SANTOS, MARIA L.", "BSCS-12M1")
+        try:
+            for quarter in main.quarters:
+                record.set_grade('PROGRAMMING', quarter, 70)
+            record.set_grade('DISCRETE', 'prelim', 90)
+
+            finals, final_avg, remarks = main.compute_grade_results(["900000"])["900000"]
+            self.assertEqual(finals, [70, 0, 0])
+            self.assertFalse(any(math.isnan(grade) for grade in finals))
+            self.assertEqual((final_avg, remarks), (70, "FAILED"))
+
+            record.set_grade('PROGRAMMING', 'final', 0)
+            self.assertEqual(main.compute_grade_results(["900000"])["900000"], ([0, 0, 0], 0, None))
+        finally:
+            del main.dict_grades["900000"]
+
+
+if __name__ == '__main__':
+    unittest.main()
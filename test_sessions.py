@@ -0,0 +1,153 @@
+import contextlib
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import main
+
+
+def open_session(name):
+    spec = importlib.util.spec_from_file_location(name, main.__file__)
+    session = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(session)
+    session.storage = session.make_storage('csv')
+    return session
+
+
+class TwoSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = os.getcwd()
+        self.work_dir = tempfile.mkdtemp()
+        os.chdir(self.work_dir)
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+        self.first = open_session('first_session')
+        self.first.load_from_files()
+        self.first.store_student("DELA CRUZ, JUAN P.", "100001", "BSCS-12M1")
+        self.first.store_student("SANTOS, MARIA L.", "100002", "BSCS-12M1")
+        self.first.apply_quarter_grades("100001", 'prelim', {subject: 80 for subject in self.first.subjects})
+        self.first.compact_files()
+
+        self.second = open_session('second_session')
+        self.second.load_from_files()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.work_dir)
+
+    def reopen(self):
+        session = open_session('fresh_session')
+        session.load_from_files()
+        return session
+
+    def test_save_merges_the_other_sessions_changes(self):
+        self.second.update_student_info("100002", name="SANTOS, MARIA C.")
+        self.second.apply_quarter_grades("100001", 'midterm', {'PROGRAMMING': 90})
+        self.second.save_to_files()
+
+        self.first.store_student("REYES, ANA B.", "100003", "BSIT-12A1")
+
+        self.assertEqual(self.first.dict_student["100002"]['name'], "SANTOS, MARIA C.")
+        self.assertIn(("SANTOS, MARIA C.", "100002"), self.first.section_index["BSCS-12M1"])
+        self.assertNotIn(("SANTOS, MARIA L.", "100002"), self.first.section_index["BSCS-12M1"])
+        self.assertEqual(self.first.search_students("SANTOS MARIA C"), ["100002"])
+        self.assertEqual(self.first.dict_grades["100001"]['PROGRAMMING']['midterm'], 90)
+        self.assertEqual(self.first.dict_grades["100001"]['DISCRETE']['prelim'], 80)
+
+        fresh = self.reopen()
+        self.assertEqual(sorted(fresh.dict_student), ["100001", "100002", "100003"])
+        self.assertEqual(fresh.dict_student["100002"]['name'], "SANTOS, MARIA C.")
+        self.assertEqual(fresh.dict_grades["100001"]['PROGRAMMING']['midterm'], 90)
+
+    def test_merge_keeps_held_student_info_current(self):
+        info = self.first.dict_student["100002"]
+        self.second.update_student_info("100002", section="BSIT-12A1")
+        self.second.save_to_files()
+
+        self.first.apply_quarter_grades("100002", 'prelim', {'STATISTICS': 85})
+        self.first.save_to_files()
+
+        self.assertEqual(info['section'], "BSIT-12A1")
+        self.assertEqual(self.first.sorted_sections, ["BSCS-12M1", "BSIT-12A1"])
+        self.assertEqual(self.first.dict_grades["100002"]['section'], "BSIT-12A1")
+
+    def test_merge_follows_a_renumber(self):
+        self.second.change_student_number("100001", "200001")
+        self.second.save_to_files()
+
+        self.first.update_student_info("100002", name="SANTOS, MARIA C.")
+        self.first.save_to_files()
+
+        self.assertNotIn("100001", self.first.dict_student)
+        self.assertNotIn("100001", self.first.dict_grades)
+        self.assertEqual(self.first.dict_student["200001"]['name'], "DELA CRUZ, JUAN P.")
+        self.assertEqual(self.first.dict_grades["200001"]['PROGRAMMING']['prelim'], 80)
+
+    def test_conflicting_changes_apply_ours_last(self):
+        self.second.update_student_info("100002", name="SANTOS, MARIA C.")
+        self.second.save_to_files()
+
+        self.first.update_student_info("100002", name="SANTOS, MARIA D.")
+        self.first.save_to_files()
+
+        self.assertEqual(self.first.dict_student["100002"]['name'], "SANTOS, MARIA D.")
+        self.assertEqual(self.reopen().dict_student["100002"]['name'], "SANTOS, MARIA D.")
+
+    def test_compaction_by_the_other_session(self):
+        self.second.apply_quarter_grades("100002", 'prelim', {'DISCRETE': 88})
+        self.second.compact_files()
+
+        self.first.apply_quarter_grades("100001", 'midterm', {'DISCRETE': 77})
+        self.first.save_to_files()
+
+        self.assertEqual(self.first.dict_grades["100002"]['DISCRETE']['prelim'], 88)
+        self.assertEqual(self.first.dict_grades["100001"]['DISCRETE']['midterm'], 77)
+
+        self.first.compact_files()
+        self.assertFalse(os.path.exists(main.CHANGE_LOG_FILE))
+
+        fresh = self.reopen()
+        self.assertEqual(fresh.dict_grades["100002"]['DISCRETE']['prelim'], 88)
+        self.assertEqual(fresh.dict_grades["100001"]['DISCRETE']['midterm'], 77)
+        self.assertEqual(fresh.dict_grades["100001"]['DISCRETE']['prelim'], 80)
+
+    def test_append_after_a_torn_write(self):
+        self.second.store_student("REYES, ANA B.", "100003", "BSIT-12A1")
+        with open(main.CHANGE_LOG_FILE, 'a') as f:
+            f.write('["student", "1000')
+
+        self.first.store_student("TAN, JO C.", "100004", "BSIT-12A1")
+        self.assertEqual(self.first.dict_student["100003"]['name'], "REYES, ANA B.")
+
+        fresh = self.reopen()
+        self.assertEqual(sorted(fresh.dict_student), ["100001", "100002", "100003", "100004"])
+
+        with open(main.CHANGE_LOG_FILE, 'a') as f:
+            f.write('["grade", "1000')
+        fresh.store_student("LIM, AL D.", "100005", "BSIT-12A1")
+
+        self.assertEqual(sorted(self.reopen().dict_student), ["100001", "100002", "100003", "100004", "100005"])
+
+    def test_deferred_grades_pick_up_the_other_sessions_changes(self):
+        deferred = open_session('deferred_session')
+        deferred.load_from_files(defer_grades=True)
+
+        self.second.apply_quarter_grades("100001", 'midterm', {'STATISTICS': 91})
+        self.second.update_student_info("100001", name="DELA CRUZ, JUAN Q.")
+        self.second.save_to_files()
+
+        deferred.store_student("REYES, ANA B.", "100003", "BSIT-12A1")
+        self.assertEqual(deferred.dict_student["100001"]['name'], "DELA CRUZ, JUAN Q.")
+
+        deferred.ensure_grades_loaded()
+        self.assertEqual(deferred.dict_grades["100001"]['STATISTICS']['midterm'], 91)
+        self.assertEqual(deferred.dict_grades["100001"]['name'], "DELA CRUZ, JUAN Q.")
+
+
+if __name__ == '__main__':
+    unittest.main()
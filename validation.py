@@ -0,0 +1,52 @@
+import re
+from functools import lru_cache
+
+LETTER = r'[^\W\d_]'
+SECTION_PATTERN = re.compile(rf'(?:{LETTER}{{4}}|{LETTER}{{3}}\d)-\d\d{LETTER}\d')
+STUDENT_NUMBER_PATTERN = re.compile(r'[0-9]{6}')
+NAME_SEPARATORS = re.compile(r'[\s.,]+')
+DIGIT = re.compile(r'\d')
+
+NAME_FORMAT_ERROR = "Name must be in format: SURNAME, FIRSTNAME M.I."
+
+
+@lru_cache(maxsize=4096)
+def validate_section(section):
+    return SECTION_PATTERN.fullmatch(section) is not None
+
+
+def validate_student_number(student_num):
+    return STUDENT_NUMBER_PATTERN.fullmatch(student_num) is not None
+
+
+def contains_digit(text):
+    return DIGIT.search(text) is not None
+
+
+def validate_name_format(name):
+    parts = name.split(',')
+    if len(parts) != 2:
+        return False, NAME_FORMAT_ERROR
+
+    if not parts[0].strip() or not parts[1].strip():
+        return False, "Both surname and given names are required."
+
+    letters = NAME_SEPARATORS.sub('', name)
+    if letters and not letters.isalpha():
+        return False, "Name can only contain letters, spaces, commas, and periods."
+
+    return True, ""
+
+
+def validate_sections(sections):
+    valid = {section for section in set(sections) if validate_section(section)}
+    return [section in valid for section in sections]
+
+
+def validate_student_numbers(student_nums):
+    return [match is not None for match in map(STUDENT_NUMBER_PATTERN.fullmatch, student_nums)]
+
+
+def validate_names(names):
+    results = {name: validate_name_format(name) for name in set(names)}
+    return [results[name] for name in names]